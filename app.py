@@ -3,17 +3,17 @@ Tata Steel Rebar Anti-Theft Monitor
 Clean, Professional Dashboard - Core Focus: Pilferage Detection
 """
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+import numpy as np
+from PIL import Image
 from datetime import datetime
-import time
+import io
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.data.simulator import TransitSimulator
 from src.data.geofences import AUTHORIZED_ZONES
-from src.data.services import traffic_service
 from src.engine.stop_analyzer import StopAnalyzer
 from src.engine.weight_analyzer import EnhancedWeightAnalyzer
 from src.engine.escalation import EscalationEngine, AlertLevel
@@ -26,14 +26,22 @@ st.set_page_config(
     layout="wide"
 )
 
-# Clean, minimal CSS
-st.markdown("""
+PLAYBACK_INTERVAL_S = 0.15
+DETECT_STRIDE = 2  # Pixel stride when downscaling camera frames for detection
+MAX_CHART_POINTS = 500  # Longer trends are downsampled before plotting
+
+
+@st.cache_resource
+def css() -> str:
+    """Clean, minimal CSS; built once per process, emitted on each full rerun."""
+    return """
 <style>
     .block-container { padding-top: 2rem; }
     .main-header { font-size: 1.8rem; font-weight: 600; color: #1d1d1f; letter-spacing: -0.5px; }
     .status-pill { display: inline-block; padding: 0.4rem 1rem; border-radius: 20px; font-weight: 500; font-size: 0.85rem; }
     .status-safe { background: #d1f2eb; color: #0d6b4e; }
     .status-alert { background: #fadbd8; color: #c0392b; }
+    .metric-row { display: grid; grid-template-columns: repeat(4, 1fr); gap: 1rem; }
     .metric-card { background: #f5f5f7; padding: 1.2rem; border-radius: 12px; text-align: center; }
     .metric-value { font-size: 1.8rem; font-weight: 600; color: #1d1d1f; }
     .metric-label { font-size: 0.75rem; color: #86868b; text-transform: uppercase; letter-spacing: 0.5px; }
@@ -43,35 +51,79 @@ st.markdown("""
     .section-title { font-size: 0.9rem; font-weight: 600; color: #86868b; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 0.8rem; }
     div[data-testid="stButton"] button { border-radius: 20px; font-weight: 500; }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+st.markdown(css(), unsafe_allow_html=True)
+
+
+def new_camera(night: bool) -> EnhancedCameraSimulator:
+    """
+    A camera simulator for one lighting mode. Not shared: generating frames writes its
+    drawing memos, clock and rng, and construction is cheap (~0.2 ms).
+    """
+    cam = EnhancedCameraSimulator()
+    cam.set_night_mode(night)
+    return cam
+
+
+@st.cache_resource
+def get_detector(night: bool) -> SimpleAIDetector:
+    """Shared detector with its baseline frame set once per lighting mode."""
+    baseline, _ = new_camera(night).generate_normal_cargo_image()
+    detector = SimpleAIDetector(detect_scale=DETECT_STRIDE)
+    detector.set_baseline(baseline)
+    return detector
+
+
+def to_jpeg(img: np.ndarray, quality: int = 75) -> bytes:
+    """Encode a frame as JPEG so the browser gets ~40 KB instead of raw RGB."""
+    buf = io.BytesIO()
+    Image.fromarray(img).save(buf, format='JPEG', quality=quality)
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def camera_frame(is_theft: bool, night: bool):
+    """
+    Render and analyze a camera frame; only the scenario and lighting vary. The pixels keep the
+    timestamp bar from when they were rendered, so live_jpeg redraws it before display.
+    """
+    cam = new_camera(night)
+    if is_theft:
+        img, persons = cam.generate_theft_image(5)
+    else:
+        img, persons = cam.generate_normal_cargo_image()
+    return img, persons, get_detector(night).analyze_frame(img)
+
+
+def live_jpeg(img: np.ndarray, is_theft: bool, night: bool) -> bytes:
+    """A cached frame with the current time in its timestamp bar, JPEG-encoded."""
+    return to_jpeg(new_camera(night).stamp_timestamp(img, "ALERT" if is_theft else "active"))
+
+
+@st.cache_resource
+def camera_setup_png() -> bytes:
+    """Landing-page illustration, read from disk once per process."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "camera_setup.png"), "rb") as f:
+        return f.read()
 
 
 def init_state():
     defaults = {
         'events': [], 'index': 0, 'mode': 'theft', 'running': False,
+        'event_cols': None, 'timeline': [], 'weight_charts': {},
         'total_weight': 5000,
-        'stop_analyzer': StopAnalyzer(),
-        'weight_analyzer': EnhancedWeightAnalyzer(),
-        'escalation': EscalationEngine(),
-        'camera': EnhancedCameraSimulator(),
-        'detector': SimpleAIDetector(),
-        'baseline_set': False, 'cam_mode': 'standby',
+        'cam_mode': 'standby', 'last_frame_key': None, 'last_frame': None,
+        'last_jpeg_key': None, 'last_jpeg': None,
     }
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
 
 
-def reset():
-    st.session_state.stop_analyzer = StopAnalyzer()
-    st.session_state.weight_analyzer = EnhancedWeightAnalyzer()
-    st.session_state.escalation = EscalationEngine()
-    st.session_state.baseline_set = False
-    st.session_state.cam_mode = 'standby'
-
-
-def generate_events(mode: str):
-    weight = st.session_state.total_weight
+def generate_events(mode: str, weight: float) -> list[dict]:
+    """Simulate a demo journey."""
     if mode == 'theft':
         sim = TransitSimulator(truck_id="TS-JH-1002", initial_weight_kg=weight)
         return sim.generate_pilferage_scenario(pilferage_at_progress=0.4, weight_stolen_kg=500, stop_duration_min=20)
@@ -79,40 +131,95 @@ def generate_events(mode: str):
     return sim.generate_normal_journey()
 
 
-def process_event(event: dict):
-    stop_result = st.session_state.stop_analyzer.process_reading(event)
-    weight_result = st.session_state.weight_analyzer.process_reading(event)
-    
-    if stop_result and stop_result.is_suspicious:
-        st.session_state.escalation.process_stop_event(stop_result)
-    if weight_result and weight_result.is_suspicious:
-        st.session_state.escalation.process_weight_alert(weight_result)
-        st.session_state.cam_mode = 'active'
+def replay_alerts(events: list[dict]) -> list[dict]:
+    """
+    Run the analyzers over the whole demo journey once.
+    Returns the alert state after each event, so playback and scrubbing are lookups.
+    """
+    stop_analyzer = StopAnalyzer()
+    weight_analyzer = EnhancedWeightAnalyzer()
+    escalation = EscalationEngine()
+    cam_mode = 'standby'
+    timeline = []
+    
+    for event in events:
+        stop_result = stop_analyzer.process_reading(event)
+        weight_result = weight_analyzer.process_reading(event)
+        
+        if stop_result and stop_result.is_suspicious:
+            escalation.process_stop_event(stop_result)
+        if weight_result and weight_result.is_suspicious:
+            escalation.process_weight_alert(weight_result)
+            cam_mode = 'active'
+        
+        state = {
+            'summary': escalation.get_alert_summary(),
+            'has_critical': any(a.level >= AlertLevel.CRITICAL for a in escalation.get_active_alerts()),
+            'cam_mode': cam_mode,
+        }
+        # Alert state is flat for long stretches; share the object so the cached pickle stays small
+        if timeline and timeline[-1] == state:
+            state = timeline[-1]
+        timeline.append(state)
+    
+    return timeline
 
 
-def render_camera(event: dict):
-    cam = st.session_state.camera
-    detector = st.session_state.detector
-    cam.set_night_mode(is_night_time())
-    
-    if not st.session_state.baseline_set:
-        baseline, _ = cam.generate_normal_cargo_image()
-        detector.set_baseline(baseline)
-        st.session_state.baseline_set = True
-    
+def to_columns(events: list[dict]) -> dict[str, np.ndarray]:
+    """Columnar (field -> array) view of the events for map and chart slicing."""
+    n = len(events)
+    return {
+        'timestamp': np.array([e['timestamp'] for e in events], dtype='datetime64[s]'),
+        'latitude': np.fromiter((e['latitude'] for e in events), dtype=np.float64, count=n),
+        'longitude': np.fromiter((e['longitude'] for e in events), dtype=np.float64, count=n),
+        'weight_kg': np.fromiter((e['weight_kg'] for e in events), dtype=np.float32, count=n),
+        'speed_kmh': np.fromiter((e['speed_kmh'] for e in events), dtype=np.float32, count=n),
+        'is_moving': np.fromiter((e['is_moving'] for e in events), dtype=bool, count=n),
+        'in_authorized_zone': np.fromiter((e['in_authorized_zone'] for e in events), dtype=bool, count=n),
+    }
+
+
+@st.cache_data(show_spinner=False, ttl="1h", max_entries=16)
+def demo_journey(mode: str, weight: float) -> tuple[list[dict], dict[str, np.ndarray], list[dict]]:
+    """
+    Events, columnar view and alert timeline for a demo, memoized per (mode, weight).
+    Cached as one entry so the three can never come from different simulator runs.
+    """
+    events = generate_events(mode, weight)
+    return events, to_columns(events), replay_alerts(events)
+
+
+def load_demo(mode: str):
+    """Load a demo journey, its columnar view and precomputed alert timeline."""
+    events, cols, timeline = demo_journey(mode, st.session_state.total_weight)
+    st.session_state.events = events
+    st.session_state.index = 0
+    st.session_state.event_cols = cols
+    st.session_state.timeline = timeline
+
+
+def render_camera(event: dict, night: bool):
+    ss = st.session_state
     is_theft = event.get('scenario') == 'pilferage' and not event.get('is_moving', True)
+    key = (is_theft, night)
     
-    if is_theft:
-        img, persons = cam.generate_theft_image(5)
-    else:
-        img, persons = cam.generate_normal_cargo_image()
+    # Frame synthesis and detection only re-run when the theft/night conditions flip;
+    # ticks in between reuse the last frame and result without unpickling it again
+    if ss.last_frame_key != key:
+        ss.last_frame = camera_frame(*key)
+        ss.last_frame_key = key
+    img, persons, result = ss.last_frame
     
-    result = detector.analyze_frame(img)
+    # The displayed clock only changes once a second, so re-encode at most that often
+    jpeg_key = (key, int(time.time()))
+    if ss.last_jpeg_key != jpeg_key:
+        ss.last_jpeg = live_jpeg(img, *key)
+        ss.last_jpeg_key = jpeg_key
     
     col1, col2 = st.columns([1.3, 1])
     
     with col1:
-        st.image(img, use_container_width=True)
+        st.image(ss.last_jpeg, use_container_width=True, output_format="JPEG")
     
     with col2:
         if result.persons_detected > 0:
@@ -134,66 +241,286 @@ def render_camera(event: dict):
                 st.toast("Security dispatched!")
 
 
-def render_map(event: dict):
+@st.cache_resource
+def folium_modules():
+    """Import folium and streamlit-folium once; None if either is not installed."""
     try:
         import folium
         from streamlit_folium import st_folium
-        
-        m = folium.Map(location=[event['latitude'], event['longitude']], zoom_start=10, 
-                      tiles='cartodbpositron')
-        
-        # Route
-        if st.session_state.events:
-            route = [[e['latitude'], e['longitude']] for e in st.session_state.events[:st.session_state.index + 1]]
-            folium.PolyLine(route, color='#007aff', weight=3, opacity=0.8).add_to(m)
-        
-        # Zones
-        for z in AUTHORIZED_ZONES:
-            folium.Circle([z.latitude, z.longitude], radius=z.radius_km*1000,
-                         color='#34c759', fill=True, fillOpacity=0.1).add_to(m)
-        
-        # Truck
-        is_alert = not event.get('is_moving') and not event.get('in_authorized_zone')
-        folium.Marker(
-            [event['latitude'], event['longitude']],
-            icon=folium.Icon(color='red' if is_alert else 'blue', icon='truck', prefix='fa')
-        ).add_to(m)
-        
-        st_folium(m, height=320, returned_objects=[])
-    except:
+    except ImportError:
+        return None
+    return folium, st_folium
+
+
+@st.cache_resource
+def base_map():
+    """Folium map with tiles and authorized zones, built once per process."""
+    folium, _ = folium_modules()
+    
+    m = folium.Map(location=[AUTHORIZED_ZONES[0].latitude, AUTHORIZED_ZONES[0].longitude],
+                   zoom_start=10, tiles='cartodbpositron')
+    for z in AUTHORIZED_ZONES:
+        folium.Circle([z.latitude, z.longitude], radius=z.radius_km*1000,
+                     color='#34c759', fill=True, fillOpacity=0.1).add_to(m)
+    return m
+
+
+@st.cache_resource
+def zone_layer():
+    """pydeck layer for the static authorized zones."""
+    import pydeck as pdk
+    
+    zones = [{'position': [z.longitude, z.latitude], 'radius': z.radius_km * 1000, 'name': z.name}
+             for z in AUTHORIZED_ZONES]
+    return pdk.Layer(
+        'ScatterplotLayer', zones, get_position='position', get_radius='radius',
+        get_fill_color=[52, 199, 89, 25], get_line_color=[52, 199, 89],
+        stroked=True, line_width_min_pixels=1, pickable=True,
+    )
+
+
+def render_map(event: dict, cols: dict | None, idx: int):
+    """WebGL map via pydeck; falls back to folium if pydeck is unavailable."""
+    try:
+        import pydeck as pdk
+    except ImportError:
+        render_folium_map(event, cols, idx)
+        return
+    
+    layers = [zone_layer()]
+    
+    # Route
+    if cols is not None:
+        end = idx + 1
+        path = np.column_stack((cols['longitude'][:end], cols['latitude'][:end])).tolist()
+        layers.append(pdk.Layer(
+            'PathLayer', [{'path': path}], get_path='path',
+            get_color=[0, 122, 255, 204], width_min_pixels=3,
+        ))
+    
+    # Truck
+    is_alert = not event.get('is_moving') and not event.get('in_authorized_zone')
+    layers.append(pdk.Layer(
+        'ScatterplotLayer', [{'position': [event['longitude'], event['latitude']]}],
+        get_position='position', get_fill_color=[255, 59, 48] if is_alert else [0, 122, 255],
+        radius_min_pixels=8, stroked=True, get_line_color=[255, 255, 255], line_width_min_pixels=2,
+    ))
+    
+    view = pdk.ViewState(latitude=event['latitude'], longitude=event['longitude'], zoom=9)
+    st.pydeck_chart(pdk.Deck(layers=layers, initial_view_state=view, height=320,
+                             map_style=pdk.map_styles.CARTO_LIGHT, tooltip={'text': '{name}'}),
+                    use_container_width=True)
+
+
+def render_folium_map(event: dict, cols: dict | None, idx: int):
+    modules = folium_modules()
+    if modules is None:
         st.info(f"📍 {event['latitude']:.4f}, {event['longitude']:.4f}")
+        return
+    folium, st_folium = modules
+    
+    # Tiles and zones stay in the cached base map; only the live layers are sent per tick
+    live = folium.FeatureGroup(name="live")
+    
+    # Route
+    if cols is not None:
+        end = idx + 1
+        route = np.column_stack((cols['latitude'][:end], cols['longitude'][:end])).tolist()
+        folium.PolyLine(route, color='#007aff', weight=3, opacity=0.8).add_to(live)
+    
+    # Truck
+    is_alert = not event.get('is_moving') and not event.get('in_authorized_zone')
+    folium.Marker(
+        [event['latitude'], event['longitude']],
+        icon=folium.Icon(color='red' if is_alert else 'blue', icon='truck', prefix='fa')
+    ).add_to(live)
+    
+    st_folium(base_map(), key="map", height=320, returned_objects=[],
+              center=(event['latitude'], event['longitude']), feature_group_to_add=live)
+
+
+def weight_chart(total_weight: float):
+    """Weight chart skeleton (styled trace, threshold line, layout), built once per session."""
+    charts = st.session_state.weight_charts
+    if total_weight in charts:
+        return charts[total_weight]
+    
+    # Plotly is only needed once a demo is loaded; keep it off the landing page's cold start
+    import plotly.graph_objects as go
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=[], y=[],
+        fill='tozeroy', fillcolor='rgba(0,122,255,0.1)',
+        line=dict(color='#007aff', width=2)
+    ))
+    fig.add_hline(y=total_weight - 100, line_dash="dot", 
+                 line_color="#ff3b30", annotation_text="Alert Threshold")
+    fig.update_layout(
+        height=200, 
+        margin=dict(l=0, r=0, t=10, b=0),
+        yaxis_title="kg",
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor='#f0f0f0'),
+        uirevision='weight',  # Keep zoom/pan across playback ticks
+        transition_duration=0,
+    )
+    charts[total_weight] = fig
+    return fig
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points that keep the trend's shape.
+    Returns all indices when the series is already short enough.
+    """
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+    
+    xf = x.astype(np.float64)
+    yf = y.astype(np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        nxt = slice(hi, edges[b + 2]) if b + 2 < len(edges) else slice(n - 1, n)
+        cx, cy = xf[nxt].mean(), yf[nxt].mean()
+        ax, ay = xf[keep[b]], yf[keep[b]]
+        area = np.abs((ax - cx) * (yf[lo:hi] - ay) - (ax - xf[lo:hi]) * (cy - ay))
+        keep[b + 1] = lo + int(area.argmax())
+    
+    return keep
+
+
+def on_scrub():
+    st.session_state.index = st.session_state.scrub
+
+
+def live_view(night: bool):
+    """Current event, status, map/camera and chart; reruns alone during playback."""
+    ss = st.session_state
+    # Current event
+    idx = min(ss.index, len(ss.events) - 1)
+    event = ss.events[idx]
+    
+    # Status (precomputed by replay_alerts)
+    state = ss.timeline[idx]
+    ss.cam_mode = state['cam_mode']
+    has_critical = state['has_critical']
+    
+    if has_critical:
+        st.markdown('<div class="alert-banner alert-critical"><strong>🚨 Theft Detected</strong> — Unauthorized cargo removal in progress</div>', unsafe_allow_html=True)
+    else:
+        st.markdown('<div class="alert-banner alert-safe"><strong>✅ All Clear</strong> — Transit proceeding normally</div>', unsafe_allow_html=True)
+    
+    # Key Metrics
+    st.markdown('<p class="section-title">Live Status</p>', unsafe_allow_html=True)
+    
+    weight_loss = ss.total_weight - event['weight_kg']
+    color = "#ff3b30" if weight_loss > 100 else "#1d1d1f"
+    status = "Moving" if event['is_moving'] else "Stopped"
+    zone = "Yes" if event.get('in_authorized_zone') else "No"
+    
+    # One markdown element for the whole row instead of one per card
+    st.markdown(
+        '<div class="metric-row">'
+        f'<div class="metric-card"><div class="metric-value">{event["speed_kmh"]:.0f}</div><div class="metric-label">Speed (km/h)</div></div>'
+        f'<div class="metric-card"><div class="metric-value" style="color:{color}">{event["weight_kg"]:,.0f}</div><div class="metric-label">Weight (kg)</div></div>'
+        f'<div class="metric-card"><div class="metric-value">{"🟢" if event["is_moving"] else "🔴"}</div><div class="metric-label">{status}</div></div>'
+        f'<div class="metric-card"><div class="metric-value">{"✅" if event.get("in_authorized_zone") else "⚠️"}</div><div class="metric-label">In Zone: {zone}</div></div>'
+        '</div>',
+        unsafe_allow_html=True
+    )
+    
+    # Timeline
+    max_idx = len(ss.events) - 1
+    # The callback moves the index before the rerun, so scrubbing renders once
+    ss.scrub = idx
+    st.slider("Timeline", 0, max_idx, key="scrub", on_change=on_scrub, label_visibility="collapsed")
+    
+    st.divider()
+    
+    # Main content
+    col_left, col_right = st.columns([1.2, 1])
+    
+    with col_left:
+        st.markdown('<p class="section-title">Location</p>', unsafe_allow_html=True)
+        render_map(event, ss.event_cols, idx)
+    
+    with col_right:
+        if has_critical or (event.get('scenario') == 'pilferage' and not event.get('is_moving')):
+            st.markdown('<p class="section-title">Camera Feed</p>', unsafe_allow_html=True)
+            render_camera(event, night)
+        else:
+            st.markdown('<p class="section-title">Alert Status</p>', unsafe_allow_html=True)
+            summary = state['summary']
+            
+            cols = st.columns(4)
+            cols[0].metric("Watch", summary['by_level']['watchlist'])
+            cols[1].metric("Warn", summary['by_level']['warning'])
+            cols[2].metric("Critical", summary['by_level']['critical'])
+            cols[3].metric("Emergency", summary['by_level']['emergency'])
+            
+            if not summary['total_active']:
+                st.info("No active alerts")
+    
+    st.divider()
+    
+    # Weight Chart
+    st.markdown('<p class="section-title">Weight Over Time</p>', unsafe_allow_html=True)
+    
+    cols = ss.event_cols
+    if cols is not None:
+        # Only the trace data changes between renders
+        fig = weight_chart(ss.total_weight)
+        x, y = cols['timestamp'][:idx + 1], cols['weight_kg'][:idx + 1]
+        keep = lttb(x, y, MAX_CHART_POINTS)
+        fig.data[0].x = x[keep]
+        fig.data[0].y = y[keep]
+        st.plotly_chart(fig, use_container_width=True, key="weight_chart")
+    
+    # Auto-play: advance one event per fragment tick
+    if ss.running and ss.index < max_idx:
+        ss.index += 1
+    elif ss.running:
+        ss.running = False
+        st.rerun()  # Full rerun to drop the fragment timer
+
 
 
 def main():
     init_state()
     
+    # One clock read per full rerun, shared by the header and the camera's lighting
+    now = datetime.now()
+    night = is_night_time(now)
+    
     # Header
     col1, col2 = st.columns([3, 1])
     with col1:
         st.markdown('<h1 class="main-header">🚛 Anti-Theft Monitor</h1>', unsafe_allow_html=True)
     with col2:
-        st.markdown(f"<div style='text-align:right; padding-top:0.5rem; color:#86868b;'>{datetime.now().strftime('%H:%M')} • <a href='https://guide-tata-steel.streamlit.app/' target='_blank'>Help</a></div>", unsafe_allow_html=True)
+        st.markdown(f"<div style='text-align:right; padding-top:0.5rem; color:#86868b;'>{now.strftime('%H:%M')} • <a href='https://guide-tata-steel.streamlit.app/' target='_blank'>Help</a></div>", unsafe_allow_html=True)
     
     # Controls
     c1, c2, c3, c4, c5 = st.columns(5)
     
     if c1.button("🔴 Theft Demo", use_container_width=True, type="primary" if not st.session_state.events or st.session_state.mode == 'theft' else "secondary"):
         st.session_state.mode = 'theft'
-        st.session_state.events = generate_events('theft')
-        st.session_state.index = 0
-        reset()
+        load_demo('theft')
         st.rerun()
     
     if c2.button("🟢 Normal Demo", use_container_width=True):
         st.session_state.mode = 'normal'
-        st.session_state.events = generate_events('normal')
-        st.session_state.index = 0
-        reset()
+        load_demo('normal')
         st.rerun()
     
     if c3.button("⏮️ Reset", use_container_width=True):
         st.session_state.index = 0
-        reset()
         st.rerun()
     
     if c4.button("▶️ Play", use_container_width=True):
@@ -225,114 +552,15 @@ def main():
             """, unsafe_allow_html=True)
         
         with col2:
-            st.image("assets/camera_setup.png", caption="Camera monitors cargo from rear of truck", use_container_width=True)
+            st.image(camera_setup_png(), caption="Camera monitors cargo from rear of truck", use_container_width=True)
         
         return
     
-    # Current event
-    idx = min(st.session_state.index, len(st.session_state.events) - 1)
-    event = st.session_state.events[idx]
-    process_event(event)
-    
-    # Status
-    alerts = st.session_state.escalation.get_active_alerts()
-    has_critical = any(a.level >= AlertLevel.CRITICAL for a in alerts)
-    
-    if has_critical:
-        st.markdown('<div class="alert-banner alert-critical"><strong>🚨 Theft Detected</strong> — Unauthorized cargo removal in progress</div>', unsafe_allow_html=True)
-    else:
-        st.markdown('<div class="alert-banner alert-safe"><strong>✅ All Clear</strong> — Transit proceeding normally</div>', unsafe_allow_html=True)
-    
-    # Key Metrics
-    st.markdown('<p class="section-title">Live Status</p>', unsafe_allow_html=True)
-    
-    m1, m2, m3, m4 = st.columns(4)
-    
-    with m1:
-        st.markdown(f'<div class="metric-card"><div class="metric-value">{event["speed_kmh"]:.0f}</div><div class="metric-label">Speed (km/h)</div></div>', unsafe_allow_html=True)
-    
-    with m2:
-        weight_loss = st.session_state.total_weight - event['weight_kg']
-        color = "#ff3b30" if weight_loss > 100 else "#1d1d1f"
-        st.markdown(f'<div class="metric-card"><div class="metric-value" style="color:{color}">{event["weight_kg"]:,.0f}</div><div class="metric-label">Weight (kg)</div></div>', unsafe_allow_html=True)
-    
-    with m3:
-        status = "Moving" if event['is_moving'] else "Stopped"
-        st.markdown(f'<div class="metric-card"><div class="metric-value">{"🟢" if event["is_moving"] else "🔴"}</div><div class="metric-label">{status}</div></div>', unsafe_allow_html=True)
-    
-    with m4:
-        zone = "Yes" if event.get('in_authorized_zone') else "No"
-        st.markdown(f'<div class="metric-card"><div class="metric-value">{"✅" if event.get("in_authorized_zone") else "⚠️"}</div><div class="metric-label">In Zone: {zone}</div></div>', unsafe_allow_html=True)
-    
-    # Timeline
-    max_idx = len(st.session_state.events) - 1
-    new_idx = st.slider("Timeline", 0, max_idx, idx, label_visibility="collapsed")
-    
-    if new_idx != st.session_state.index:
-        st.session_state.index = new_idx
-        reset()
-        for i in range(new_idx + 1):
-            process_event(st.session_state.events[i])
-        st.rerun()
-    
-    st.divider()
-    
-    # Main content
-    col_left, col_right = st.columns([1.2, 1])
-    
-    with col_left:
-        st.markdown('<p class="section-title">Location</p>', unsafe_allow_html=True)
-        render_map(event)
-    
-    with col_right:
-        if has_critical or (event.get('scenario') == 'pilferage' and not event.get('is_moving')):
-            st.markdown('<p class="section-title">Camera Feed</p>', unsafe_allow_html=True)
-            render_camera(event)
-        else:
-            st.markdown('<p class="section-title">Alert Status</p>', unsafe_allow_html=True)
-            summary = st.session_state.escalation.get_alert_summary()
-            
-            cols = st.columns(4)
-            cols[0].metric("Watch", summary['by_level']['watchlist'])
-            cols[1].metric("Warn", summary['by_level']['warning'])
-            cols[2].metric("Critical", summary['by_level']['critical'])
-            cols[3].metric("Emergency", summary['by_level']['emergency'])
-            
-            if not alerts:
-                st.info("No active alerts")
-    
-    st.divider()
-    
-    # Weight Chart
-    st.markdown('<p class="section-title">Weight Over Time</p>', unsafe_allow_html=True)
-    
-    df = pd.DataFrame(st.session_state.events[:idx + 1])
-    if not df.empty:
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df['timestamp'], y=df['weight_kg'],
-            fill='tozeroy', fillcolor='rgba(0,122,255,0.1)',
-            line=dict(color='#007aff', width=2)
-        ))
-        fig.add_hline(y=st.session_state.total_weight - 100, line_dash="dot", 
-                     line_color="#ff3b30", annotation_text="Alert Threshold")
-        fig.update_layout(
-            height=200, 
-            margin=dict(l=0, r=0, t=10, b=0),
-            yaxis_title="kg",
-            xaxis=dict(showgrid=False),
-            yaxis=dict(showgrid=True, gridcolor='#f0f0f0')
-        )
-        st.plotly_chart(fig, use_container_width=True)
-    
-    # Auto-play
-    if st.session_state.running and st.session_state.index < max_idx:
-        time.sleep(0.15)
-        st.session_state.index += 1
-        process_event(st.session_state.events[st.session_state.index])
-        st.rerun()
-    elif st.session_state.running:
-        st.session_state.running = False
+    # Only the live view reruns on each playback tick. A timed fragment updates its
+    # elements in place like st.empty() placeholders would, without a blocking
+    # sleep loop, so Stop and the slider stay responsive.
+    run_every = PLAYBACK_INTERVAL_S if st.session_state.running else None
+    st.fragment(run_every=run_every)(live_view)(night)
 
 
 if __name__ == "__main__":
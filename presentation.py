@@ -4,9 +4,7 @@ Streamlit-based slide deck for hackathon pitch
 """
 import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-import pandas as pd
-from datetime import datetime
+import os
 
 st.set_page_config(
     page_title="Tata Steel - Presentation",
@@ -14,87 +12,129 @@ st.set_page_config(
     layout="wide"
 )
 
-# Presentation CSS
-st.markdown("""
-<style>
-    .slide-header { font-size: 2.5rem; font-weight: 700; color: #1a5276; margin-bottom: 1rem; }
-    .slide-subheader { font-size: 1.3rem; color: #2e86ab; margin-bottom: 2rem; }
-    .big-number { font-size: 4rem; font-weight: bold; color: #e74c3c; }
-    .highlight-box { background: linear-gradient(135deg, #667eea, #764ba2); color: white; 
-                     padding: 2rem; border-radius: 15px; text-align: center; margin: 1rem 0; }
-    .problem-card { background: #fee2e2; padding: 1.5rem; border-radius: 10px; 
-                    border-left: 5px solid #e74c3c; margin: 0.5rem 0; }
-    .solution-card { background: #d1fae5; padding: 1.5rem; border-radius: 10px; 
-                     border-left: 5px solid #10b981; margin: 0.5rem 0; }
-    .feature-card { background: #f0f9ff; padding: 1rem; border-radius: 10px; 
-                    border: 1px solid #bae6fd; margin: 0.5rem; text-align: center; }
-    .timeline-item { padding: 1rem; margin: 0.3rem 0; border-radius: 8px; }
-    .timeline-normal { background: #d1fae5; }
-    .timeline-alert { background: #fee2e2; }
-    .nav-btn { font-size: 1.5rem; }
-</style>
-""", unsafe_allow_html=True)
 
-# Slide counter
-if 'slide' not in st.session_state:
-    st.session_state.slide = 1
+@st.cache_resource
+def css() -> str:
+    """Presentation styles from assets/presentation.css, read from disk once per process."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "presentation.css")) as f:
+        return f"<style>\n{f.read()}</style>"
 
-TOTAL_SLIDES = 10
 
-# Navigation
-col1, col2, col3 = st.columns([1, 3, 1])
-with col1:
-    if st.button("⬅️ Previous", use_container_width=True, disabled=st.session_state.slide <= 1):
-        st.session_state.slide -= 1
-        st.rerun()
-with col2:
-    st.markdown(f"<div style='text-align:center; padding:0.5rem;'>Slide {st.session_state.slide} of {TOTAL_SLIDES}</div>", 
-                unsafe_allow_html=True)
-with col3:
-    if st.button("Next ➡️", use_container_width=True, disabled=st.session_state.slide >= TOTAL_SLIDES):
-        st.session_state.slide += 1
-        st.rerun()
+st.markdown(css(), unsafe_allow_html=True)
+
+
+# Slide charts are for presenting, not exploring: render them without hover,
+# zoom or the modebar so Plotly.js skips wiring up the interaction layers
+STATIC_CHART = {"staticPlot": True}
+
+
+# Static figures: built once per process and shared read-only across sessions.
+# cache_resource rather than cache_data, which would unpickle a fresh Figure per rerun.
+@st.cache_resource
+def loss_trend_fig():
+    """Monthly theft losses for slide 2."""
+    months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
+    losses = [4.2, 3.8, 5.1, 4.5, 4.8, 4.3]
+    
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=months, y=losses, marker_color='#e74c3c'))
+    fig.update_layout(title="Monthly Theft Losses (₹ Crore)", height=300,
+                     margin=dict(l=20, r=20, t=50, b=20))
+    return fig
+
+
+@st.cache_resource
+def decision_flow_fig():
+    """Detection decision Sankey for slide 4."""
+    fig = go.Figure(go.Sankey(
+        node=dict(
+            label=["Event", "Weight OK?", "In Zone?", "Normal", "Alert", "Critical"],
+            color=["#3498db", "#f39c12", "#e74c3c", "#27ae60", "#f39c12", "#e74c3c"]
+        ),
+        link=dict(
+            source=[0, 1, 1, 2, 2],
+            target=[1, 3, 2, 3, 4],
+            value=[100, 70, 30, 15, 15]
+        )
+    ))
+    fig.update_layout(height=300, margin=dict(l=0, r=0, t=20, b=0))
+    return fig
+
+
+@st.cache_resource
+def alert_funnel_fig():
+    """Alert distribution funnel for slide 5."""
+    fig = go.Figure(go.Funnel(
+        y=["All Events", "Watchlist", "Warning", "Critical", "Emergency"],
+        x=[100, 30, 15, 5, 2],
+        textinfo="value+percent initial",
+        marker=dict(color=['#3498db', '#f1c40f', '#e67e22', '#e74c3c', '#c0392b'])
+    ))
+    fig.update_layout(title="Alert Distribution", height=300)
+    return fig
+
+
+@st.cache_resource
+def model_accuracy_fig():
+    """Per-model AI accuracy bars for slide 7."""
+    # plotly.express (and the pandas it pulls in) is only needed for this chart
+    import plotly.express as px
+    
+    models = ['Person Detection', 'Cargo Change', 'Obstruction', 'Night Vision']
+    accuracy = [94.3, 91.2, 97.1, 92.0]
+    
+    fig = px.bar(x=models, y=accuracy, 
+                color=accuracy, 
+                color_continuous_scale='RdYlGn',
+                text=[f"{a}%" for a in accuracy])
+    fig.update_layout(height=300, showlegend=False,
+                     yaxis_title="Accuracy %", xaxis_title="")
+    fig.update_traces(textposition='outside')
+    return fig
+
+
+@st.cache_resource
+def before_after_fig():
+    """Before vs after deployment bars for slide 8."""
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name='Before', x=['Detection', 'Response', 'Recovery'], y=[15, 24, 20],
+                        marker_color='#e74c3c'))
+    fig.add_trace(go.Bar(name='After', x=['Detection', 'Response', 'Recovery'], y=[95, 0.1, 75],
+                        marker_color='#27ae60'))
+    fig.update_layout(barmode='group', height=250,
+                     yaxis_title="Rate/Time", legend=dict(orientation='h'))
+    return fig
 
-st.progress(st.session_state.slide / TOTAL_SLIDES)
-st.divider()
 
 # ========== SLIDE 1: Title ==========
-if st.session_state.slide == 1:
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    st.markdown('<h1 style="text-align:center; font-size:3.5rem; color:#1a5276;">🚛 Tata Steel</h1>', unsafe_allow_html=True)
-    st.markdown('<h2 style="text-align:center; color:#2e86ab;">Rebar Anti-Theft Monitoring System</h2>', unsafe_allow_html=True)
-    st.markdown('<p style="text-align:center; font-size:1.3rem; color:#666;">AI-Powered Pilferage Prevention for Transit Operations</p>', unsafe_allow_html=True)
-    
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.markdown("""
+def slide_title():
+    st.html("""
+    <br><br>
+    <h1 style="text-align:center; font-size:3.5rem; color:#1a5276;">🚛 Tata Steel</h1>
+    <h2 style="text-align:center; color:#2e86ab;">Rebar Anti-Theft Monitoring System</h2>
+    <p style="text-align:center; font-size:1.3rem; color:#666;">AI-Powered Pilferage Prevention for Transit Operations</p>
+    <br><br>
+    <div class="card-row">
         <div class="highlight-box">
             <div style="font-size:3rem;">📡</div>
             <div>Real-Time GPS</div>
         </div>
-        """, unsafe_allow_html=True)
-    with col2:
-        st.markdown("""
         <div class="highlight-box">
             <div style="font-size:3rem;">⚖️</div>
             <div>Weight Sensors</div>
         </div>
-        """, unsafe_allow_html=True)
-    with col3:
-        st.markdown("""
         <div class="highlight-box">
             <div style="font-size:3rem;">📹</div>
             <div>AI Camera</div>
         </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    st.markdown('<p style="text-align:center;">Shrinath PS -Individual</p>', unsafe_allow_html=True)
+    </div>
+    <br><br>
+    <p style="text-align:center;">Shrinath PS -Individual</p>
+    """)
+
 
 # ========== SLIDE 2: The Problem ==========
-elif st.session_state.slide == 2:
+def slide_problem():
     st.markdown('<h1 class="slide-header">😰 The Problem</h1>', unsafe_allow_html=True)
     st.markdown('<p class="slide-subheader">Rebar Pilferage During Transit</p>', unsafe_allow_html=True)
     
@@ -119,69 +159,47 @@ elif st.session_state.slide == 2:
     
     with col2:
         # Loss trend chart
-        months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
-        losses = [4.2, 3.8, 5.1, 4.5, 4.8, 4.3]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(x=months, y=losses, marker_color='#e74c3c'))
-        fig.update_layout(title="Monthly Theft Losses (₹ Crore)", height=300,
-                         margin=dict(l=20, r=20, t=50, b=20))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(loss_trend_fig(), use_container_width=True, config=STATIC_CHART)
         
         st.error("🚨 **150+ theft incidents per year**")
 
+
 # ========== SLIDE 3: Our Solution ==========
-elif st.session_state.slide == 3:
-    st.markdown('<h1 class="slide-header">💡 Our Solution</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="slide-subheader">Multi-Sensor AI Monitoring System</p>', unsafe_allow_html=True)
-    
+def slide_solution():
     # Architecture diagram
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
+    st.html("""
+    <h1 class="slide-header">💡 Our Solution</h1>
+    <p class="slide-subheader">Multi-Sensor AI Monitoring System</p>
+    <div class="card-row">
         <div class="feature-card" style="height:200px;">
             <div style="font-size:3rem;">📡</div>
             <h3>GPS Tracking</h3>
             <p>Real-time location<br>Geofence alerts<br>Route monitoring</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
         <div class="feature-card" style="height:200px;">
             <div style="font-size:3rem;">⚖️</div>
             <h3>Weight Sensors</h3>
             <p>4× Load cells<br>±10kg precision<br>Instant detection</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
         <div class="feature-card" style="height:200px;">
             <div style="font-size:3rem;">📹</div>
             <h3>AI Camera</h3>
             <p>Person detection<br>Night vision (IR)<br>Auto-activation</p>
         </div>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
-    
-    st.markdown("""
+    </div>
+    <br>
     <div style="text-align:center; padding:1rem;">
         <span style="font-size:2rem;">⬇️</span>
     </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
     <div class="highlight-box">
         <h2>🧠 Edge AI Processing (Raspberry Pi 5)</h2>
         <p>Local processing • Works offline • Real-time alerts • Evidence recording</p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
+
 
 # ========== SLIDE 4: How It Works ==========
-elif st.session_state.slide == 4:
+def slide_how_it_works():
     st.markdown('<h1 class="slide-header">⚙️ How Detection Works</h1>', unsafe_allow_html=True)
     st.markdown('<p class="slide-subheader">SOP-Based Decision Engine</p>', unsafe_allow_html=True)
     
@@ -204,26 +222,11 @@ if persons_detected > 0:
     
     with col2:
         st.markdown("### 📊 Decision Flow")
-        
-        fig = go.Figure(go.Sankey(
-            node=dict(
-                label=["Event", "Weight OK?", "In Zone?", "Normal", "Alert", "Critical"],
-                color=["#3498db", "#f39c12", "#e74c3c", "#27ae60", "#f39c12", "#e74c3c"]
-            ),
-            link=dict(
-                source=[0, 1, 1, 2, 2],
-                target=[1, 3, 2, 3, 4],
-                value=[100, 70, 30, 15, 15]
-            )
-        ))
-        fig.update_layout(height=300, margin=dict(l=0, r=0, t=20, b=0))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(decision_flow_fig(), use_container_width=True, config=STATIC_CHART)
+
 
 # ========== SLIDE 5: 4-Level Alerts ==========
-elif st.session_state.slide == 5:
-    st.markdown('<h1 class="slide-header">🚨 4-Level Alert System</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="slide-subheader">Standard Operating Procedure (SOP)</p>', unsafe_allow_html=True)
-    
+def slide_alert_levels():
     alerts = [
         ("🟡", "Level 1: Watchlist", "Log event only", "#fef9c3"),
         ("🟠", "Level 2: Warning", "SMS to driver", "#fed7aa"),
@@ -231,40 +234,34 @@ elif st.session_state.slide == 5:
         ("🚨", "Level 4: Emergency", "Security dispatched", "#fee2e2"),
     ]
     
-    cols = st.columns(4)
-    for i, (icon, title, action, color) in enumerate(alerts):
-        with cols[i]:
-            st.markdown(f"""
-            <div style="background:{color}; padding:1.5rem; border-radius:10px; height:200px; text-align:center;">
-                <div style="font-size:3rem;">{icon}</div>
-                <h4>{title}</h4>
-                <p>{action}</p>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    st.markdown("<br>", unsafe_allow_html=True)
+    cards = "".join(f"""
+        <div style="background:{color}; padding:1.5rem; border-radius:10px; height:200px; text-align:center;">
+            <div style="font-size:3rem;">{icon}</div>
+            <h4>{title}</h4>
+            <p>{action}</p>
+        </div>""" for icon, title, action, color in alerts)
+    st.html(f"""
+    <h1 class="slide-header">🚨 4-Level Alert System</h1>
+    <p class="slide-subheader">Standard Operating Procedure (SOP)</p>
+    <div class="card-row">{cards}
+    </div>
+    <br>
+    """)
     
     # Funnel chart
-    fig = go.Figure(go.Funnel(
-        y=["All Events", "Watchlist", "Warning", "Critical", "Emergency"],
-        x=[100, 30, 15, 5, 2],
-        textinfo="value+percent initial",
-        marker=dict(color=['#3498db', '#f1c40f', '#e67e22', '#e74c3c', '#c0392b'])
-    ))
-    fig.update_layout(title="Alert Distribution", height=300)
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(alert_funnel_fig(), use_container_width=True, config=STATIC_CHART)
+
 
 # ========== SLIDE 6: Live Demo ==========
-elif st.session_state.slide == 6:
-    st.markdown('<h1 class="slide-header">🎬 Live Demo</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="slide-subheader">Watch the system catch a theft in real-time</p>', unsafe_allow_html=True)
-    
-    st.markdown("""
+def slide_live_demo():
+    st.html("""
+    <h1 class="slide-header">🎬 Live Demo</h1>
+    <p class="slide-subheader">Watch the system catch a theft in real-time</p>
     <div class="highlight-box">
         <h2>👆 Open the Dashboard</h2>
         <p style="font-size:1.5rem;"><a href="https://build-ids26---tata-steel-hackathon.streamlit.app/" target="_blank" style="color:white;">Open Live Dashboard</a></p>
     </div>
-    """, unsafe_allow_html=True)
+    """)
     
     st.markdown("### 📋 Demo Steps")
     
@@ -282,8 +279,9 @@ elif st.session_state.slide == 6:
         with cols[i % 3]:
             st.info(f"**{num} {action}**\n\n{desc}")
 
+
 # ========== SLIDE 7: AI Camera Tech ==========
-elif st.session_state.slide == 7:
+def slide_ai_camera():
     st.markdown('<h1 class="slide-header">📹 AI & Camera Technology</h1>', unsafe_allow_html=True)
     st.markdown('<p class="slide-subheader">State-of-the-art detection with night vision</p>', unsafe_allow_html=True)
     
@@ -291,18 +289,7 @@ elif st.session_state.slide == 7:
     
     with col1:
         st.markdown("### 🤖 AI Models")
-        
-        models = ['Person Detection', 'Cargo Change', 'Obstruction', 'Night Vision']
-        accuracy = [94.3, 91.2, 97.1, 92.0]
-        
-        fig = px.bar(x=models, y=accuracy, 
-                    color=accuracy, 
-                    color_continuous_scale='RdYlGn',
-                    text=[f"{a}%" for a in accuracy])
-        fig.update_layout(height=300, showlegend=False,
-                         yaxis_title="Accuracy %", xaxis_title="")
-        fig.update_traces(textposition='outside')
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(model_accuracy_fig(), use_container_width=True, config=STATIC_CHART)
     
     with col2:
         st.markdown("### 🎯 Key Features")
@@ -324,8 +311,9 @@ elif st.session_state.slide == 7:
         col_a.info("☀️ **Day Mode**\n\nColor camera, 94% accuracy")
         col_b.info("🌙 **Night Mode**\n\nIR vision, 92% accuracy")
 
+
 # ========== SLIDE 8: Real Case Study ==========
-elif st.session_state.slide == 8:
+def slide_case_study():
     st.markdown('<h1 class="slide-header">📋 Real Case Study</h1>', unsafe_allow_html=True)
     st.markdown('<p class="slide-subheader">Highway Night Theft - Caught in Action</p>', unsafe_allow_html=True)
     
@@ -359,18 +347,11 @@ elif st.session_state.slide == 8:
         st.markdown("<br>", unsafe_allow_html=True)
         
         st.markdown("### 📊 Before vs After")
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(name='Before', x=['Detection', 'Response', 'Recovery'], y=[15, 24, 20],
-                            marker_color='#e74c3c'))
-        fig.add_trace(go.Bar(name='After', x=['Detection', 'Response', 'Recovery'], y=[95, 0.1, 75],
-                            marker_color='#27ae60'))
-        fig.update_layout(barmode='group', height=250,
-                         yaxis_title="Rate/Time", legend=dict(orientation='h'))
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(before_after_fig(), use_container_width=True, config=STATIC_CHART)
+
 
 # ========== SLIDE 9: ROI & Impact ==========
-elif st.session_state.slide == 9:
+def slide_roi():
     st.markdown('<h1 class="slide-header">💰 ROI & Business Impact</h1>', unsafe_allow_html=True)
     st.markdown('<p class="slide-subheader">Massive returns with minimal investment</p>', unsafe_allow_html=True)
     
@@ -414,10 +395,13 @@ elif st.session_state.slide == 9:
         </div>
         """, unsafe_allow_html=True)
 
+
 # ========== SLIDE 10: Next Steps ==========
-elif st.session_state.slide == 10:
-    st.markdown('<h1 class="slide-header">🚀 Implementation Roadmap</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="slide-subheader">From PoC to Fleet Deployment</p>', unsafe_allow_html=True)
+def slide_roadmap():
+    st.html("""
+    <h1 class="slide-header">🚀 Implementation Roadmap</h1>
+    <p class="slide-subheader">From PoC to Fleet Deployment</p>
+    """)
     
     col1, col2 = st.columns(2)
     
@@ -429,13 +413,12 @@ elif st.session_state.slide == 10:
             ("🚀", "Phase 4: Advanced", "ML + Mobile", "Ongoing"),
         ]
         
-        for icon, phase, desc, time in phases:
-            st.markdown(f"""
+        st.html("".join(f"""
             <div class="solution-card">
                 <h3>{icon} {phase}</h3>
                 <p>{desc} • {time}</p>
             </div>
-            """, unsafe_allow_html=True)
+            """ for icon, phase, desc, time in phases))
     
     with col2:
         st.markdown("### 🎯 Success Criteria")
@@ -463,6 +446,57 @@ elif st.session_state.slide == 10:
         </div>
         """, unsafe_allow_html=True)
 
+
+SLIDES = {
+    1: slide_title,
+    2: slide_problem,
+    3: slide_solution,
+    4: slide_how_it_works,
+    5: slide_alert_levels,
+    6: slide_live_demo,
+    7: slide_ai_camera,
+    8: slide_case_study,
+    9: slide_roi,
+    10: slide_roadmap,
+}
+TOTAL_SLIDES = len(SLIDES)
+
+
+def go_to(slide: int):
+    """Switch slide from a navigation callback, keeping the jump selectbox in sync."""
+    st.session_state.slide = slide
+    st.session_state.nav = slide
+
+
+def jump_to_selected():
+    """Follow the jump selectbox."""
+    st.session_state.slide = st.session_state.nav
+
+
+# Slide counter
+if 'slide' not in st.session_state:
+    st.session_state.slide = 1
+    st.session_state.nav = 1
+
+# Navigation: callbacks update the slide before this run starts, so each click
+# costs one rerun instead of a rerun plus an st.rerun() restart
+col1, col2, col3 = st.columns([1, 3, 1])
+with col1:
+    st.button("⬅️ Previous", use_container_width=True, disabled=st.session_state.slide <= 1,
+              on_click=go_to, args=(st.session_state.slide - 1,))
+with col2:
+    st.markdown(f"<div style='text-align:center; padding:0.5rem;'>Slide {st.session_state.slide} of {TOTAL_SLIDES}</div>", 
+                unsafe_allow_html=True)
+with col3:
+    st.button("Next ➡️", use_container_width=True, disabled=st.session_state.slide >= TOTAL_SLIDES,
+              on_click=go_to, args=(st.session_state.slide + 1,))
+
+st.progress(st.session_state.slide / TOTAL_SLIDES)
+st.divider()
+
+# Only the active slide's renderer runs
+SLIDES[st.session_state.slide]()
+
 # Footer
 st.divider()
 col1, col2, col3 = st.columns(3)
@@ -472,8 +506,4 @@ with col2:
     st.caption(f"Slide {st.session_state.slide} of {TOTAL_SLIDES}")
 with col3:
     # Quick navigation
-    new_slide = st.selectbox("Jump to slide:", range(1, TOTAL_SLIDES + 1), 
-                             index=st.session_state.slide - 1, key="nav")
-    if new_slide != st.session_state.slide:
-        st.session_state.slide = new_slide
-        st.rerun()
+    st.selectbox("Jump to slide:", range(1, TOTAL_SLIDES + 1), key="nav", on_change=jump_to_selected)
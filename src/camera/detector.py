@@ -2,14 +2,16 @@
 Simple AI Detector - Simulates AI-based cargo and person detection.
 For demo purposes - compares images and detects persons.
 """
+import threading
+
 import numpy as np
 from dataclasses import dataclass
 from typing import List, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class DetectionResult:
-    """Result of AI detection."""
+    """Result of AI detection; frozen, as results are passed around and cached after analysis."""
     cargo_change_detected: bool
     cargo_change_percent: float
     persons_detected: int
@@ -23,14 +25,38 @@ class SimpleAIDetector:
     Uses image comparison and color-based person detection.
     """
     
-    def __init__(self):
+    def __init__(self, detect_scale: int = 1):
+        self.detect_scale = detect_scale  # Analyze every Nth pixel per axis; 1 = full resolution
         self.baseline_image = None
+        self._baseline_sum = None  # Baseline channel sums, reused by every cargo check
+        self._inv_scale = None  # 100 / largest possible total diff for the baseline's shape
         self.cargo_change_threshold = 15.0  # Percent change to trigger alert
         self.critical_threshold = 30.0  # Percent change for critical alert
+        self.person_pixel_threshold = 500  # Matching pixels to count a person (at full resolution)
+        # Per-thread scratch arrays: the dashboard shares one detector across sessions
+        self._scratch = threading.local()
         
     def set_baseline(self, image: np.ndarray):
         """Set the baseline image for comparison."""
-        self.baseline_image = image.copy()
+        # Keep a read-only view instead of a copy; only its channel sums are used per frame
+        self.baseline_image = image.view()
+        self.baseline_image.flags.writeable = False
+        self._baseline_sum = self._sample(image).sum(axis=2, dtype=np.int16)
+        self._inv_scale = 100.0 / (self._baseline_sum.size * 3 * 255)
+    
+    def _sample(self, image: np.ndarray) -> np.ndarray:
+        """Decimated view of a frame at detect_scale (no copy)."""
+        if self.detect_scale == 1:
+            return image
+        return image[::self.detect_scale, ::self.detect_scale]
+    
+    def _buffers(self, shape: tuple) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """This thread's (int16 diff, bool mask, bool scratch) arrays for a frame shape, allocated on first use."""
+        buffers = getattr(self._scratch, 'buffers', None)
+        if buffers is None or buffers[0].shape != shape:
+            buffers = (np.empty(shape, dtype=np.int16), np.empty(shape, dtype=bool), np.empty(shape, dtype=bool))
+            self._scratch.buffers = buffers
+        return buffers
     
     def detect_cargo_change(self, current_image: np.ndarray) -> Tuple[bool, float]:
         """
@@ -40,15 +66,16 @@ class SimpleAIDetector:
         if self.baseline_image is None:
             return False, 0.0
         
-        # Convert to grayscale for comparison
-        baseline_gray = np.mean(self.baseline_image, axis=2)
-        current_gray = np.mean(current_image, axis=2)
-        
-        # Calculate absolute difference
-        diff = np.abs(baseline_gray.astype(float) - current_gray.astype(float))
+        # Compare channel sums (3x grayscale) in int16: no float temporaries, and
+        # 3 * 255 fits, so the subtraction and abs can run in place
+        current_image = self._sample(current_image)
+        diff, _, _ = self._buffers(current_image.shape[:2])
+        np.sum(current_image, axis=2, dtype=np.int16, out=diff)
+        np.subtract(self._baseline_sum, diff, out=diff)
+        np.abs(diff, out=diff)
         
         # Calculate change percentage
-        change_percent = (np.sum(diff) / diff.size) * 100 / 255  # Normalize to 0-100
+        change_percent = int(diff.sum(dtype=np.int64)) * self._inv_scale  # Normalize to 0-100
         
         change_detected = change_percent > self.cargo_change_threshold
         
@@ -62,26 +89,26 @@ class SimpleAIDetector:
         """
         person_count = 0
         
-        # Define color ranges for person detection (RGB)
+        image = self._sample(image)
+        r, g, b = image[:, :, 0], image[:, :, 1], image[:, :, 2]
+        _, mask, tmp = self._buffers(image.shape[:2])
+        
+        # Define color ranges for person detection (RGB); each channel test is
+        # written into the scratch buffers and ANDed in place, so no temporaries
         # Red person (around #e74c3c)
-        red_mask = (
-            (image[:, :, 0] > 180) & 
-            (image[:, :, 1] < 100) & 
-            (image[:, :, 2] < 100)
-        )
-        red_pixels = np.sum(red_mask)
+        np.greater(r, 180, out=mask)
+        mask &= np.less(g, 100, out=tmp)
+        mask &= np.less(b, 100, out=tmp)
+        red_pixels = np.count_nonzero(mask)
         
         # Blue person (around #3498db)
-        blue_mask = (
-            (image[:, :, 0] < 100) & 
-            (image[:, :, 1] > 100) & 
-            (image[:, :, 2] > 180)
-        )
-        blue_pixels = np.sum(blue_mask)
-        
-        # Threshold for person detection
-        pixel_threshold = 500
+        np.less(r, 100, out=mask)
+        mask &= np.greater(g, 100, out=tmp)
+        mask &= np.greater(b, 180, out=tmp)
+        blue_pixels = np.count_nonzero(mask)
         
+        # The threshold is set for full resolution; a decimated frame has scale**2 fewer pixels
+        pixel_threshold = self.person_pixel_threshold / self.detect_scale ** 2
         if red_pixels > pixel_threshold:
             person_count += 1
         if blue_pixels > pixel_threshold:
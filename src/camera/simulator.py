@@ -1,6 +1,8 @@
 """
 Enhanced Camera Simulator with Bounding Boxes, Night Mode, and Obstruction Detection
 """
+import time
+
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
@@ -8,7 +10,7 @@ from dataclasses import dataclass
 from typing import List, Tuple
 
 
-@dataclass
+@dataclass(frozen=True)
 class BoundingBox:
     """Represents a detected object bounding box."""
     x1: int
@@ -20,7 +22,7 @@ class BoundingBox:
     color: str = "#00ff00"
 
 
-@dataclass
+@dataclass(slots=True)
 class DetectedPerson:
     """Detected person with bounding box."""
     id: int
@@ -45,6 +47,15 @@ class EnhancedCameraSimulator:
         self.is_powered = True
         self.power_mode = "active"  # active, standby, sleep
         self.ir_enabled = False
+        self._backgrounds = {}  # is_night_mode -> truck bed backdrop Image, see _background
+        self._power_stamps = {}  # (power_mode, backdrop color) -> indicator Image, see _power_stamp
+        self._person_stamps = {}  # fill color -> (pixels, 1-bit mask), see _person_stamp
+        self._rebar_layers = {}  # (is_night_mode, bundles, highlight_missing, missing_count) -> overlay, see _rebar_layer
+        self.rng = np.random.default_rng()
+        self._timestamp = (0, "")  # (epoch second, formatted) for _draw_timestamp
+        # Loaded once: a fresh ImageDraw would otherwise reload the default font on its first text call
+        self._font = ImageFont.load_default()
+        self._text_boxes = {}  # label text -> textbbox at the origin, see _draw_bounding_box
         
     def set_night_mode(self, enabled: bool):
         """Toggle night/IR vision mode."""
@@ -79,12 +90,16 @@ class EnhancedCameraSimulator:
         
         # Draw label background
         label_text = f"{bbox.label} ({bbox.confidence:.0%})"
-        text_bbox = draw.textbbox((bbox.x1, bbox.y1 - 20), label_text)
+        # Labels recur frame to frame; measure each once and shift it into place
+        text_bbox = self._text_boxes.get(label_text)
+        if text_bbox is None:
+            text_bbox = self._text_boxes[label_text] = draw.textbbox((0, 0), label_text, font=self._font)
+        x, y = bbox.x1, bbox.y1 - 20
         draw.rectangle(
-            [text_bbox[0] - 2, text_bbox[1] - 2, text_bbox[2] + 2, text_bbox[3] + 2],
+            [x + text_bbox[0] - 2, y + text_bbox[1] - 2, x + text_bbox[2] + 2, y + text_bbox[3] + 2],
             fill=bbox.color
         )
-        draw.text((bbox.x1, bbox.y1 - 20), label_text, fill='black')
+        draw.text((x, y), label_text, fill='black', font=self._font)
     
     def _draw_open_truck_bed(self, draw: ImageDraw):
         """Draw view from camera mounted at top of truck cabin, looking down at cargo bed."""
@@ -123,10 +138,32 @@ class EnhancedCameraSimulator:
         
         # "OVERSIZE LOAD" banner at bottom (like reference)
         draw.rectangle([50, self.height - 50, self.width - 50, self.height - 25], fill='#FFD700')
-        draw.text((self.width//2 - 60, self.height - 47), "OVERSIZE LOAD", fill='#000000')
+        draw.text((self.width//2 - 60, self.height - 47), "OVERSIZE LOAD", fill='#000000', font=self._font)
     
-    def _draw_steel_rebars(self, draw: ImageDraw, bundles: int = 6, highlight_missing: bool = False, missing_count: int = 0):
-        """Draw realistic long steel TMT rebar bundles as seen from above/behind."""
+    def _background(self) -> Image.Image:
+        """Truck bed backdrop for the current lighting mode, drawn once and copied per frame."""
+        background = self._backgrounds.get(self.is_night_mode)
+        if background is None:
+            background = Image.new('RGB', (self.width, self.height), color='#2a2a2a')
+            self._draw_open_truck_bed(ImageDraw.Draw(background))
+            self._backgrounds[self.is_night_mode] = background
+        return background
+    
+    def _rebar_layer(self, bundles: int, highlight_missing: bool, missing_count: int) -> Tuple[Image.Image, Image.Image, Tuple[int, int]]:
+        """Realistic long steel TMT rebar bundles as seen from above/behind, as a pasteable overlay.
+        
+        Drawn once per lighting mode and load; frames paste it instead of redrawing ~150 shapes.
+        Returns (pixels, 1-bit mask, offset), cropped to the drawn area: the shapes are not
+        antialiased, so a 1-bit mask pastes them exactly and far faster than an RGBA layer.
+        """
+        key = (self.is_night_mode, bundles, highlight_missing, missing_count)
+        layer = self._rebar_layers.get(key)
+        if layer is not None:
+            return layer
+        
+        layer = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(layer)
+        
         # Rebar colors
         if self.is_night_mode:
             steel_color = '#4a4a5a'
@@ -145,6 +182,15 @@ class EnhancedCameraSimulator:
         bundle_start_x = 100
         actual_bundles = bundles - missing_count
         
+        # Bundle straps (horizontal bands): width follows perspective only, so it is
+        # the same for every bundle; compute (y, x offset, width) once
+        straps = []
+        for strap_y in [150, 220, 290, 360]:
+            if strap_y < self.height - 80:
+                perspective_factor = (strap_y - 100) / (self.height - 170)
+                strap_width = int(bundle_width * (0.7 + 0.3 * perspective_factor))
+                straps.append((strap_y, (bundle_width - strap_width) // 2, strap_width))
+        
         for b in range(bundles):
             bx = bundle_start_x + b * (bundle_width + 15)
             
@@ -173,13 +219,9 @@ class EnhancedCameraSimulator:
                 draw.line([(start_x + 1, start_y), (end_x + 1, end_y)], fill=steel_highlight, width=1)
             
             # Bundle straps (horizontal bands)
-            for strap_y in [150, 220, 290, 360]:
-                if strap_y < self.height - 80:
-                    # Calculate strap width based on perspective
-                    perspective_factor = (strap_y - 100) / (self.height - 170)
-                    strap_width = int(bundle_width * (0.7 + 0.3 * perspective_factor))
-                    strap_x = bx + (bundle_width - strap_width) // 2
-                    draw.rectangle([strap_x, strap_y, strap_x + strap_width, strap_y + 6], fill=strap_color)
+            for strap_y, strap_offset, strap_width in straps:
+                strap_x = bx + strap_offset
+                draw.rectangle([strap_x, strap_y, strap_x + strap_width, strap_y + 6], fill=strap_color)
             
             # Bundle end circles (cross-section view at bottom)
             for rod in range(8):
@@ -187,10 +229,21 @@ class EnhancedCameraSimulator:
                 cy = self.height - 65
                 draw.ellipse([cx - 3, cy - 3, cx + 3, cy + 3], fill=steel_color, outline=steel_highlight)
         
+        box = layer.getbbox() or (0, 0, 1, 1)  # Nothing drawn: a transparent pixel
+        layer = layer.crop(box)
+        self._rebar_layers[key] = (layer.convert('RGB'), layer.getchannel('A').convert('1'), box[:2])
+        return self._rebar_layers[key]
+    
+    def _draw_steel_rebars(self, img: Image.Image, draw: ImageDraw, bundles: int = 6, highlight_missing: bool = False, missing_count: int = 0):
+        """Draw realistic long steel TMT rebar bundles as seen from above/behind."""
+        pixels, mask, offset = self._rebar_layer(bundles, highlight_missing, missing_count)
+        img.paste(pixels, offset, mask)
+        actual_bundles = bundles - missing_count
+        
         # Weight indicator at bottom
         label_color = '#ffffff' if self.is_night_mode else '#333333'
         weight = actual_bundles * 830
-        draw.text((100, self.height - 22), f"TMT 500D | {actual_bundles}/{bundles} BUNDLES | {weight}kg", fill=label_color)
+        draw.text((100, self.height - 22), f"TMT 500D | {actual_bundles}/{bundles} BUNDLES | {weight}kg", fill=label_color, font=self._font)
     
     def _draw_rebar_bundles(self, draw: ImageDraw, count: int, start_x: int = 50):
         """Draw rebar bundles."""
@@ -213,43 +266,74 @@ class EnhancedCameraSimulator:
     
     def _draw_timestamp(self, draw: ImageDraw, monitoring_mode: str = "active"):
         """Add timestamp with mode indicators."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Formatted at most once per wall-clock second
+        second, timestamp = self._timestamp
+        now = int(time.time())
+        if now != second:
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+            self._timestamp = (now, timestamp)
         mode_text = "🌙 IR" if self.is_night_mode else "☀️ DAY"
         
         draw.rectangle([0, 0, 320, 25], fill='black')
-        draw.text((5, 5), f"CAM-01 | {timestamp} | {mode_text} | {monitoring_mode.upper()}", fill='white')
+        draw.text((5, 5), f"CAM-01 | {timestamp} | {mode_text} | {monitoring_mode.upper()}", fill='white', font=self._font)
     
-    def _draw_power_indicator(self, draw: ImageDraw):
-        """Draw power/battery indicator."""
+    def _power_stamp(self, background: Tuple[int, int, int]) -> Image.Image:
+        """Battery icon and percentage for the current power mode over a plain background, drawn once."""
+        key = (self.power_mode, background)
+        stamp = self._power_stamps.get(key)
+        if stamp is not None:
+            return stamp
+        
         battery_levels = {"active": 87, "standby": 92, "sleep": 95}
         battery = battery_levels.get(self.power_mode, 87)
         
-        # Battery icon position (top right)
-        bx, by = self.width - 80, 5
+        stamp = Image.new('RGB', (55, 35), background)
+        draw = ImageDraw.Draw(stamp)
         
         # Battery outline
-        draw.rectangle([bx, by, bx + 50, by + 18], outline='white', width=1)
-        draw.rectangle([bx + 50, by + 5, bx + 54, by + 13], fill='white')
+        draw.rectangle([0, 0, 50, 18], outline='white', width=1)
+        draw.rectangle([50, 5, 54, 13], fill='white')
         
         # Battery fill
         fill_width = int(48 * battery / 100)
         fill_color = '#27ae60' if battery > 50 else '#f39c12' if battery > 20 else '#e74c3c'
-        draw.rectangle([bx + 2, by + 2, bx + 2 + fill_width, by + 16], fill=fill_color)
+        draw.rectangle([2, 2, 2 + fill_width, 16], fill=fill_color)
+        
+        draw.text((0, 20), f"{battery}%", fill='white', font=self._font)
         
-        draw.text((bx, by + 20), f"{battery}%", fill='white')
+        self._power_stamps[key] = stamp
+        return stamp
     
-    def _draw_person_with_bbox(self, draw: ImageDraw, x: int, y: int, 
+    def _draw_power_indicator(self, img: Image.Image):
+        """Draw power/battery indicator."""
+        # Battery icon position (top right), over the plain cabin/standby backdrop
+        bx, by = self.width - 80, 5
+        img.paste(self._power_stamp(img.getpixel((bx, by))), (bx, by))
+    
+    def _person_stamp(self, person_color: str) -> Tuple[Image.Image, Image.Image]:
+        """Person figure (head, body, legs) as pixels plus a 1-bit mask, drawn once per color."""
+        stamp = self._person_stamps.get(person_color)
+        if stamp is None:
+            figure = Image.new('RGBA', (31, 111), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(figure)
+            # Head
+            draw.ellipse([0, 0, 30, 30], fill=person_color, outline='black')
+            # Body
+            draw.rectangle([5, 32, 25, 80], fill=person_color, outline='black')
+            # Legs
+            draw.rectangle([5, 82, 13, 110], fill=person_color, outline='black')
+            draw.rectangle([17, 82, 25, 110], fill=person_color, outline='black')
+            stamp = (figure.convert('RGB'), figure.getchannel('A').convert('1'))
+            self._person_stamps[person_color] = stamp
+        return stamp
+    
+    def _draw_person_with_bbox(self, img: Image.Image, draw: ImageDraw, x: int, y: int, 
                                 person_id: int, color: str) -> DetectedPerson:
         """Draw a person figure with bounding box."""
         person_color = '#8888aa' if self.is_night_mode else color
         
-        # Head
-        draw.ellipse([x, y, x + 30, y + 30], fill=person_color, outline='black')
-        # Body
-        draw.rectangle([x + 5, y + 32, x + 25, y + 80], fill=person_color, outline='black')
-        # Legs
-        draw.rectangle([x + 5, y + 82, x + 13, y + 110], fill=person_color, outline='black')
-        draw.rectangle([x + 17, y + 82, x + 25, y + 110], fill=person_color, outline='black')
+        pixels, mask = self._person_stamp(person_color)
+        img.paste(pixels, (x, y), mask)
         
         # Create bounding box
         bbox = BoundingBox(
@@ -268,14 +352,12 @@ class EnhancedCameraSimulator:
     
     def generate_normal_cargo_image(self, monitoring_mode: str = "active") -> Tuple[np.ndarray, List[DetectedPerson]]:
         """Generate realistic image of steel rebars on open bed truck."""
-        img = Image.new('RGB', (self.width, self.height), color='#2a2a2a')
+        # Open truck bed, copied from the cached backdrop
+        img = self._background().copy()
         draw = ImageDraw.Draw(img)
         
-        # Draw open truck bed
-        self._draw_open_truck_bed(draw)
-        
         # Draw steel rebar bundles (6 full bundles)
-        self._draw_steel_rebars(draw, bundles=6, highlight_missing=False)
+        self._draw_steel_rebars(img, draw, bundles=6, highlight_missing=False)
         
         # Cargo zone bounding box
         zone_color = '#00ff00' if monitoring_mode == 'continuous' else '#ffaa00'
@@ -285,23 +367,21 @@ class EnhancedCameraSimulator:
         status_text = "MONITORING" if monitoring_mode == 'continuous' else "CHECK"
         status_color = '#27ae60' if monitoring_mode == 'continuous' else '#f5a623'
         draw.rectangle([self.width - 160, 60, self.width - 10, 85], fill=status_color)
-        draw.text((self.width - 150, 65), f"{status_text}", fill='white')
+        draw.text((self.width - 150, 65), f"{status_text}", fill='white', font=self._font)
         
         self._draw_timestamp(draw, monitoring_mode)
-        self._draw_power_indicator(draw)
+        self._draw_power_indicator(img)
         
         return np.array(img), []
     
     def generate_theft_image(self, bundles_stolen: int = 2) -> Tuple[np.ndarray, List[DetectedPerson]]:
         """Generate theft image showing stolen rebars with persons near truck."""
-        img = Image.new('RGB', (self.width, self.height), color='#2a2a2a')
+        # Open truck bed, copied from the cached backdrop
+        img = self._background().copy()
         draw = ImageDraw.Draw(img)
         
-        # Draw open truck bed
-        self._draw_open_truck_bed(draw)
-        
         # Draw steel rebars with missing bundles highlighted
-        self._draw_steel_rebars(draw, bundles=6, highlight_missing=True, missing_count=bundles_stolen)
+        self._draw_steel_rebars(img, draw, bundles=6, highlight_missing=True, missing_count=bundles_stolen)
         
         # Cargo zone with ALERT
         draw.rectangle([90, 130, self.width - 70, 360], outline='#ff0000', width=3)
@@ -309,47 +389,45 @@ class EnhancedCameraSimulator:
         # Draw persons (thieves) near the truck
         detected_persons = []
         # Person 1 - near rear of truck
-        person1 = self._draw_person_with_bbox(draw, 30, 250, 1, '#e74c3c')
+        person1 = self._draw_person_with_bbox(img, draw, 30, 250, 1, '#e74c3c')
         # Person 2 - on the side
-        person2 = self._draw_person_with_bbox(draw, self.width - 70, 260, 2, '#e74c3c')
+        person2 = self._draw_person_with_bbox(img, draw, self.width - 70, 260, 2, '#e74c3c')
         detected_persons.extend([person1, person2])
         
         # Alert overlay
         draw.rectangle([self.width - 200, 60, self.width - 10, 85], fill='#e74c3c')
-        draw.text((self.width - 190, 65), f"⚠ {len(detected_persons)} PERSONS", fill='white')
+        draw.text((self.width - 190, 65), f"⚠ {len(detected_persons)} PERSONS", fill='white', font=self._font)
         
         # THEFT warning
         draw.rectangle([10, 60, 180, 85], fill='#e74c3c')
-        draw.text((20, 65), f"-{bundles_stolen} BUNDLES", fill='white')
+        draw.text((20, 65), f"-{bundles_stolen} BUNDLES", fill='white', font=self._font)
         
         self._draw_timestamp(draw, "ALERT")
-        self._draw_power_indicator(draw)
+        self._draw_power_indicator(img)
         
         # Recording indicator
         draw.ellipse([10, 30, 25, 45], fill='#ff0000')  # Red recording dot
-        draw.text((30, 30), "REC", fill='#ff0000')
+        draw.text((30, 30), "REC", fill='#ff0000', font=self._font)
         
         return np.array(img), detected_persons
     
     def generate_obstruction_image(self) -> np.ndarray:
         """Generate image showing camera obstruction."""
-        bg_color = '#1a1a1a'
-        img = Image.new('RGB', (self.width, self.height), color=bg_color)
-        draw = ImageDraw.Draw(img)
+        # Static noise pattern: 500 gray specks on a #1a1a1a frame, placed in one go
+        frame = np.full((self.height, self.width, 3), 0x1a, dtype=np.uint8)
+        ys = self.rng.integers(0, self.height, 500)
+        xs = self.rng.integers(0, self.width, 500)
+        frame[ys, xs] = self.rng.integers(50, 100, 500, dtype=np.uint8)[:, None]
         
-        # Static noise pattern
-        for _ in range(500):
-            x = np.random.randint(0, self.width)
-            y = np.random.randint(0, self.height)
-            gray = np.random.randint(50, 100)
-            draw.point((x, y), fill=(gray, gray, gray))
+        img = Image.fromarray(frame)
+        draw = ImageDraw.Draw(img)
         
         # Warning overlay
         draw.rectangle([self.width//2 - 150, self.height//2 - 30, 
                         self.width//2 + 150, self.height//2 + 30], 
                        fill='#e74c3c')
         draw.text((self.width//2 - 140, self.height//2 - 15), 
-                  "⚠ CAMERA OBSTRUCTED", fill='white')
+                  "⚠ CAMERA OBSTRUCTED", fill='white', font=self._font)
         
         self._draw_timestamp(draw)
         
@@ -362,19 +440,44 @@ class EnhancedCameraSimulator:
         
         # Standby message
         draw.text((self.width//2 - 80, self.height//2 - 10), 
-                  "📷 CAMERA STANDBY", fill='#666666')
+                  "📷 CAMERA STANDBY", fill='#666666', font=self._font)
         draw.text((self.width//2 - 100, self.height//2 + 20), 
-                  "Activates on alert trigger", fill='#444444')
+                  "Activates on alert trigger", fill='#444444', font=self._font)
         
         self._draw_timestamp(draw)
-        self._draw_power_indicator(draw)
+        self._draw_power_indicator(img)
         
         return np.array(img)
+    
+    def stamp_timestamp(self, frame: np.ndarray, monitoring_mode: str = "active") -> np.ndarray:
+        """Copy of a rendered frame with its timestamp bar redrawn for the current time."""
+        img = Image.fromarray(frame)
+        self._draw_timestamp(ImageDraw.Draw(img), monitoring_mode)
+        return np.array(img)
+    
+    def generate_frames(self, scenarios: List[Tuple[str, dict]]) -> np.ndarray:
+        """
+        Render many frames into one (N, height, width, 3) uint8 array, e.g. for video export.
+        Each scenario is (kind, kwargs) with kind 'normal', 'theft', 'obstruction' or 'standby';
+        kwargs go to the matching generate_* method.
+        """
+        generators = {
+            'normal': self.generate_normal_cargo_image,
+            'theft': self.generate_theft_image,
+            'obstruction': self.generate_obstruction_image,
+            'standby': self.generate_standby_image,
+        }
+        
+        frames = np.empty((len(scenarios), self.height, self.width, 3), dtype=np.uint8)
+        for i, (kind, kwargs) in enumerate(scenarios):
+            frame = generators[kind](**kwargs)
+            frames[i] = frame[0] if isinstance(frame, tuple) else frame
+        return frames
 
 
-def is_night_time() -> bool:
-    """Check if current time is night (6 PM - 6 AM)."""
-    hour = datetime.now().hour
+def is_night_time(now: datetime = None) -> bool:
+    """Check if current (or given) time is night (6 PM - 6 AM)."""
+    hour = (now or datetime.now()).hour
     return hour >= 18 or hour <= 6
 
 
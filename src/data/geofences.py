@@ -2,11 +2,14 @@
 Geofence definitions for authorized zones.
 """
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Tuple
 import math
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class GeofenceZone:
     """Represents an authorized zone (rest stop, warehouse, etc.)"""
     name: str
@@ -54,6 +57,34 @@ AUTHORIZED_ZONES: List[GeofenceZone] = [
 ]
 
 
+# Zone centres and radii as arrays, for batch lookups over many points
+_ZONE_LATS = np.radians([z.latitude for z in AUTHORIZED_ZONES])
+_ZONE_LONS = np.radians([z.longitude for z in AUTHORIZED_ZONES])
+_ZONE_COS_LATS = np.cos(_ZONE_LATS)
+_ZONE_RADII = np.array([z.radius_km for z in AUTHORIZED_ZONES])
+# Allowed stop per zone, with a trailing 0 so index -1 (no zone) looks up "no stop allowed"
+_ZONE_MAX_STOP = np.array([z.max_stop_duration_min for z in AUTHORIZED_ZONES] + [0], dtype=np.int16)
+
+
+def _bounding_box(zone: GeofenceZone) -> Tuple[float, float, float, float]:
+    """(south, north, west, east) in degrees, slightly padded, enclosing the zone's circle."""
+    angle = zone.radius_km / 6371  # Radius as an angle, in radians
+    half_lat = math.degrees(angle)
+    # A point dlon away is at least cos(lat1) * cos(lat2) * sin(dlon / 2)**2 from the centre
+    # in haversine terms, so bound dlon using the circle's most poleward latitude
+    cos_edge = math.cos(math.radians(abs(zone.latitude)) + angle)
+    half_lon = math.degrees(2 * math.asin(min(1.0, math.sin(angle / 2) / cos_edge)))
+    pad = 1.001
+    return (zone.latitude - half_lat * pad, zone.latitude + half_lat * pad,
+            zone.longitude - half_lon * pad, zone.longitude + half_lon * pad)
+
+
+# The same per zone as plain floats for single-point checks, where NumPy call overhead would dominate,
+# plus a bounding box so points clear of a zone skip the trigonometry
+_ZONE_TRIG = [(zone, _bounding_box(zone), lat, lon, cos_lat) for zone, lat, lon, cos_lat in zip(
+    AUTHORIZED_ZONES, _ZONE_LATS.tolist(), _ZONE_LONS.tolist(), _ZONE_COS_LATS.tolist())]
+
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two coordinates in kilometers."""
     R = 6371  # Earth's radius in km
@@ -69,15 +100,64 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     return R * c
 
 
+def haversine_distances(lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+    """haversine_distance elementwise over coordinate arrays, in kilometers."""
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    delta_lat = np.radians(np.subtract(lat2, lat1))
+    delta_lon = np.radians(np.subtract(lon2, lon1))
+    
+    a = np.sin(delta_lat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    
+    return 6371 * c
+
+
 def is_in_authorized_zone(latitude: float, longitude: float) -> Tuple[bool, GeofenceZone | None]:
     """Check if a location is within any authorized zone."""
-    for zone in AUTHORIZED_ZONES:
-        distance = haversine_distance(latitude, longitude, zone.latitude, zone.longitude)
+    # haversine_distance with the zone side's radians and cosine precomputed
+    for zone, (south, north, west, east), zone_lat, zone_lon, zone_cos_lat in _ZONE_TRIG:
+        if not (south <= latitude <= north and west <= longitude <= east):
+            continue
+        lat = math.radians(latitude)
+        lon = math.radians(longitude)
+        a = math.sin((zone_lat - lat) / 2)**2 + math.cos(lat) * zone_cos_lat * math.sin((zone_lon - lon) / 2)**2
+        distance = 2 * 6371 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
         if distance <= zone.radius_km:
             return True, zone
     return False, None
 
 
+@lru_cache(maxsize=65536)
+def is_in_authorized_zone_cached(latitude: float, longitude: float) -> Tuple[bool, GeofenceZone | None]:
+    """is_in_authorized_zone memoized on the exact coordinates, for trucks reporting the same fix while stopped."""
+    return is_in_authorized_zone(latitude, longitude)
+
+
+def zone_indices(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """Index into AUTHORIZED_ZONES of the zone containing each point, or -1, via one points x zones distance matrix."""
+    lat = np.radians(np.asarray(latitudes, dtype=float))[:, None]
+    lon = np.radians(np.asarray(longitudes, dtype=float))[:, None]
+    
+    a = np.sin((_ZONE_LATS - lat) / 2)**2 + np.cos(lat) * _ZONE_COS_LATS * np.sin((_ZONE_LONS - lon) / 2)**2
+    distance = 2 * 6371 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    # First matching zone in list order, same as the scalar lookup
+    inside = distance <= _ZONE_RADII
+    return np.where(inside.any(axis=1), inside.argmax(axis=1), -1).astype(np.intp)
+
+
+def zones_for_points(latitudes: np.ndarray, longitudes: np.ndarray) -> List[Tuple[bool, GeofenceZone | None]]:
+    """is_in_authorized_zone for many points at once."""
+    return [(True, AUTHORIZED_ZONES[i]) if i >= 0 else (False, None)
+            for i in zone_indices(latitudes, longitudes).tolist()]
+
+
+def max_stop_durations(latitudes: np.ndarray, longitudes: np.ndarray) -> np.ndarray:
+    """get_max_stop_duration for many points at once (minutes, 0 outside every zone)."""
+    return _ZONE_MAX_STOP[zone_indices(latitudes, longitudes)]
+
+
 def get_max_stop_duration(latitude: float, longitude: float) -> int:
     """Get maximum allowed stop duration for a location (in minutes)."""
     is_authorized, zone = is_in_authorized_zone(latitude, longitude)
@@ -5,11 +5,12 @@ Converts the dataset format to our internal event format.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Dict, Optional
 import os
 import random
 
-from .geofences import is_in_authorized_zone, AUTHORIZED_ZONES
+from .geofences import haversine_distances, zones_for_points, AUTHORIZED_ZONES
 
 
 class RealDataLoader:
@@ -18,14 +19,32 @@ class RealDataLoader:
     def __init__(self, data_path: str = None):
         self.data_path = data_path or "data/Delivery truck trip data.xlsx"
         self.df = None
+        self._by_booking = {}  # BookingID -> row positions in df, see _load_data
         self._load_data()
     
     def _load_data(self):
-        """Load the Excel data."""
+        """Load the Excel data, via a Parquet copy once it has been parsed."""
         if os.path.exists(self.data_path):
-            self.df = pd.read_excel(self.data_path)
-            # Clean column names
-            self.df.columns = self.df.columns.str.strip()
+            # Parsing the workbook's XML takes seconds; keep a Parquet copy next to it and
+            # reuse it for as long as it is newer than the workbook (Parquet, unlike a pickle,
+            # can't run code on load)
+            cache_path = os.path.splitext(self.data_path)[0] + ".parquet"
+            self.df = None
+            if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(self.data_path):
+                try:
+                    self.df = pd.read_parquet(cache_path)
+                except Exception as e:  # Corrupt or unreadable cache: parse the workbook instead
+                    print(f"Could not read cached data {cache_path}: {e}")
+            if self.df is None:
+                self.df = pd.read_excel(self.data_path)
+                # Clean column names
+                self.df.columns = self.df.columns.str.strip()
+                try:
+                    self.df.to_parquet(cache_path)
+                except Exception as e:  # Unwritable location, or a column Arrow can't store
+                    print(f"Could not cache data to {cache_path}: {e}")
+            # Row positions per trip, so trip lookups skip a full-column comparison
+            self._by_booking = self.df.groupby('BookingID', sort=False).indices
             print(f"Loaded {len(self.df)} records from {self.data_path}")
         else:
             print(f"Data file not found: {self.data_path}")
@@ -41,13 +60,16 @@ class RealDataLoader:
         """Get list of unique booking IDs."""
         if self.df.empty:
             return []
-        return self.df['BookingID'].dropna().unique().tolist()
+        return list(self._by_booking)
     
     def get_trip_data(self, booking_id: str) -> pd.DataFrame:
         """Get all GPS pings for a specific trip."""
         if self.df.empty:
             return pd.DataFrame()
-        return self.df[self.df['BookingID'] == booking_id].copy()
+        rows = self._by_booking.get(booking_id)
+        if rows is None:
+            return self.df.iloc[:0].copy()
+        return self.df.iloc[rows]
     
     def convert_to_events(self, booking_id: str, inject_pilferage: bool = False) -> List[dict]:
         """
@@ -61,71 +83,80 @@ class RealDataLoader:
         # Sort by ping time
         trip_df = trip_df.sort_values('Data_Ping_time')
         
-        events = []
+        # Work on whole columns; rows without a usable time or position are dropped
+        timestamps = pd.to_datetime(trip_df['Data_Ping_time'], errors='coerce')
+        lat = pd.to_numeric(trip_df['Curr_lat'], errors='coerce')
+        lon = pd.to_numeric(trip_df['Curr_lon'], errors='coerce')
+        valid = (timestamps.notna() & lat.notna() & lon.notna()).to_numpy()
+        rows = trip_df[valid]
+        timestamps = timestamps[valid]
+        lat = lat.to_numpy(float)[valid]
+        lon = lon.to_numpy(float)[valid]
+        n = len(rows)
+        if n == 0:
+            return []
+        # ISO strings for the whole column at once, to the second
+        timestamps = np.datetime_as_string(timestamps.to_numpy('datetime64[s]')).tolist()
+        
+        # Speed from the distance to the previous ping, assuming 1-minute intervals
+        distance = haversine_distances(lat[:-1], lon[:-1], lat[1:], lon[1:])
+        speed = np.concatenate(([0.0], distance * 60))  # km/h
+        is_moving = np.concatenate(([True], speed[1:] > 5))  # Consider stopped if < 5 km/h
+        
+        # Check if in authorized zone
+        zones = zones_for_points(lat, lon)
+        in_zone = np.array([hit for hit, _ in zones], dtype=bool)
+        
+        # Weight simulation with optional pilferage
         initial_weight = 25000  # Assumed initial weight
-        current_weight = initial_weight
-        prev_lat, prev_lon = None, None
-        pilferage_injected = False
+        weight_change = np.random.default_rng().uniform(-2, 2, n)  # Normal noise
+        pilferage = np.zeros(n, dtype=bool)
+        
+        # Inject pilferage scenario at the first unauthorized stop mid-trip
+        if inject_pilferage:
+            progress = np.arange(n) / max(len(trip_df), 1)
+            candidates = (progress > 0.4) & (progress < 0.6) & ~is_moving & ~in_zone
+            if candidates.any():
+                # Perfect pilferage conditions - unauthorized stop
+                theft = int(candidates.argmax())
+                weight_change[theft] = -500
+                pilferage[theft:] = True
         
-        for idx, row in trip_df.iterrows():
-            try:
-                timestamp = pd.to_datetime(row['Data_Ping_time'])
-                lat = float(row['Curr_lat']) if pd.notna(row['Curr_lat']) else None
-                lon = float(row['Curr_lon']) if pd.notna(row['Curr_lon']) else None
-                
-                if lat is None or lon is None:
-                    continue
-                
-                # Calculate speed based on position change
-                speed = 0.0
-                is_moving = True
-                if prev_lat is not None and prev_lon is not None:
-                    from .geofences import haversine_distance
-                    distance = haversine_distance(prev_lat, prev_lon, lat, lon)
-                    # Assume 1-minute intervals between pings
-                    speed = distance * 60  # km/h
-                    is_moving = speed > 5  # Consider stopped if < 5 km/h
-                
-                # Check if in authorized zone
-                in_zone, zone = is_in_authorized_zone(lat, lon)
-                
-                # Weight simulation with optional pilferage
-                weight_change = random.uniform(-2, 2)  # Normal noise
-                
-                # Inject pilferage scenario
-                if inject_pilferage and not pilferage_injected:
-                    progress = len(events) / max(len(trip_df), 1)
-                    if progress > 0.4 and progress < 0.6 and not is_moving and not in_zone:
-                        # Perfect pilferage conditions - unauthorized stop
-                        current_weight -= 500  # Steal 500kg
-                        weight_change = -500
-                        pilferage_injected = True
-                
-                events.append({
-                    'timestamp': timestamp.isoformat(),
-                    'truck_id': str(row['vehicle_no']),
-                    'booking_id': str(booking_id),
-                    'latitude': round(lat, 6),
-                    'longitude': round(lon, 6),
-                    'speed_kmh': round(max(0, speed), 1),
-                    'is_moving': is_moving,
-                    'weight_kg': round(current_weight + weight_change, 1),
-                    'weight_change_kg': round(weight_change, 1),
-                    'in_authorized_zone': in_zone,
-                    'zone_name': zone.name if zone else None,
-                    'current_location': str(row.get('Current_Location', '')),
-                    'origin': str(row.get('Origin_Location', '')),
-                    'destination': str(row.get('Destination_Location', '')),
-                    'driver_name': str(row.get('Driver_Name', 'Unknown')),
-                    'alert_level': 0,
-                    'scenario': 'pilferage' if pilferage_injected else 'real_data'
-                })
-                
-                prev_lat, prev_lon = lat, lon
-                
-            except Exception as e:
-                print(f"Error processing row: {e}")
-                continue
+        # 500kg stolen from the theft onward, on top of the reading's own change
+        weight = initial_weight - 500 * pilferage + weight_change
+        
+        def column(name: str, default: str) -> List[str]:
+            if name not in rows:
+                return [str(default)] * n
+            return [str(value) for value in rows[name].tolist()]
+        
+        events = [
+            {
+                'timestamp': ts,
+                'truck_id': truck_id,
+                'booking_id': str(booking_id),
+                'latitude': la,
+                'longitude': lo,
+                'speed_kmh': sp,
+                'is_moving': moving,
+                'weight_kg': w,
+                'weight_change_kg': change,
+                'in_authorized_zone': hit,
+                'zone_name': zone.name if zone else None,
+                'current_location': current,
+                'origin': origin,
+                'destination': destination,
+                'driver_name': driver,
+                'alert_level': 0,
+                'scenario': 'pilferage' if stolen else 'real_data'
+            }
+            for ts, truck_id, la, lo, sp, moving, w, change, (hit, zone), current, origin, destination, driver, stolen in zip(
+                timestamps, column('vehicle_no', ''), np.round(lat, 6).tolist(), np.round(lon, 6).tolist(),
+                np.round(speed, 1).tolist(), is_moving.tolist(), np.round(weight, 1).tolist(),
+                np.round(weight_change, 1).tolist(), zones,
+                column('Current_Location', ''), column('Origin_Location', ''),
+                column('Destination_Location', ''), column('Driver_Name', 'Unknown'), pilferage.tolist())
+        ]
         
         return events
     
@@ -135,8 +166,7 @@ class RealDataLoader:
             return []
         
         # Get trips with multiple GPS pings
-        trip_counts = self.df.groupby('BookingID').size()
-        multi_ping_trips = trip_counts[trip_counts >= 10].index.tolist()
+        multi_ping_trips = [booking_id for booking_id, rows in self._by_booking.items() if len(rows) >= 10]
         
         if not multi_ping_trips:
             # Fallback to any trip
@@ -149,12 +179,18 @@ class RealDataLoader:
         return []
 
 
+@lru_cache(maxsize=None)
+def get_loader(data_path: str = None) -> RealDataLoader:
+    """Shared RealDataLoader per data file, so the dataset is read once per process."""
+    return RealDataLoader(data_path)
+
+
 def generate_hybrid_data(use_real_data: bool = True, inject_pilferage: bool = True) -> List[dict]:
     """
     Generate data using real dataset if available, otherwise use simulator.
     """
     if use_real_data:
-        loader = RealDataLoader()
+        loader = get_loader()
         events = loader.get_sample_journey(inject_pilferage=inject_pilferage)
         if events:
             return events
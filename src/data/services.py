@@ -2,15 +2,19 @@
 Traffic and Historical Data Services
 Simulated API responses for traffic status and theft history
 """
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import List, Optional
 import random
 
+import numpy as np
 
-@dataclass
+
+@dataclass(frozen=True)
 class TrafficStatus:
-    """Traffic status from simulated API."""
+    """Traffic status from simulated API; frozen since the same instances are returned on every call."""
     condition: str  # 'light', 'moderate', 'heavy', 'jam'
     delay_minutes: int
     reason: Optional[str]
@@ -18,7 +22,7 @@ class TrafficStatus:
     icon: str
 
 
-@dataclass 
+@dataclass(slots=True)
 class TheftRecord:
     """Historical theft record."""
     date: datetime
@@ -31,6 +35,17 @@ class TheftRecord:
     description: str
 
 
+@lru_cache(maxsize=24)
+def _hour_conditions(hour: int) -> tuple:
+    """(conditions, weights) to draw the traffic condition from at a given hour, as TrafficService.TRAFFIC_STATES indices."""
+    # Rush hour simulation: moderate, heavy, jam
+    if 8 <= hour <= 10 or 17 <= hour <= 20:
+        return (1, 2, 3), (0.3, 0.5, 0.2)
+    elif 22 <= hour or hour <= 5:
+        return (0,), (1.0,)  # Always light
+    return (0, 1, 2), (0.5, 0.4, 0.1)  # light, moderate, heavy
+
+
 class TrafficService:
     """Simulated Google Maps Traffic API."""
     
@@ -40,53 +55,54 @@ class TrafficService:
         {"name": "Bypass Road Kolaghat", "lat": 22.43, "lon": 87.88, "risk_factor": 0.6},
         {"name": "Industrial Area Jamshedpur", "lat": 22.80, "lon": 86.20, "risk_factor": 0.4},
     ]
+    _HOTSPOT_LATS = np.array([h['lat'] for h in HIGH_RISK_ROUTES])
+    _HOTSPOT_LONS = np.array([h['lon'] for h in HIGH_RISK_ROUTES])
+    
+    # Responses per condition (light, moderate, heavy, jam), shared by every call
+    TRAFFIC_STATES = (
+        TrafficStatus('light', 0, None, '#27ae60', '🟢'),
+        TrafficStatus('moderate', 10, 'Normal traffic', '#f39c12', '🟡'),
+        TrafficStatus('heavy', 25, 'Congestion ahead', '#e67e22', '🟠'),
+        TrafficStatus('jam', 45, 'Traffic jam - accident reported', '#e74c3c', '🔴'),
+    )
     
     def get_traffic_status(self, lat: float, lon: float) -> TrafficStatus:
         """Get traffic status for a location (simulated)."""
         # Simulate varying traffic conditions
-        hour = datetime.now().hour
-        
-        # Rush hour simulation
-        if 8 <= hour <= 10 or 17 <= hour <= 20:
-            conditions = ['moderate', 'heavy', 'jam']
-            weights = [0.3, 0.5, 0.2]
-        elif 22 <= hour or hour <= 5:
-            conditions = ['light', 'light', 'light']
-            weights = [1.0, 0, 0]
-        else:
-            conditions = ['light', 'moderate', 'heavy']
-            weights = [0.5, 0.4, 0.1]
-        
+        conditions, weights = _hour_conditions(datetime.now().hour)
         condition = random.choices(conditions, weights)[0]
         
-        traffic_data = {
-            'light': TrafficStatus('light', 0, None, '#27ae60', '🟢'),
-            'moderate': TrafficStatus('moderate', 10, 'Normal traffic', '#f39c12', '🟡'),
-            'heavy': TrafficStatus('heavy', 25, 'Congestion ahead', '#e67e22', '🟠'),
-            'jam': TrafficStatus('jam', 45, 'Traffic jam - accident reported', '#e74c3c', '🔴'),
-        }
-        
-        return traffic_data.get(condition, traffic_data['light'])
+        return self.TRAFFIC_STATES[condition]
     
     def get_route_risk(self, lat: float, lon: float) -> dict:
         """Calculate route risk based on location."""
-        min_distance = float('inf')
-        nearest_hotspot = None
-        
-        for hotspot in self.HIGH_RISK_ROUTES:
-            dist = ((lat - hotspot['lat'])**2 + (lon - hotspot['lon'])**2)**0.5
-            if dist < min_distance:
-                min_distance = dist
-                nearest_hotspot = hotspot
-        
-        if min_distance < 0.5 and nearest_hotspot:
+        # Nearest hotspot (first on ties); squared distances rank the same and skip the sqrt
+        min_distance2, nearest = min(
+            ((lat - hotspot['lat'])**2 + (lon - hotspot['lon'])**2, i)
+            for i, hotspot in enumerate(self.HIGH_RISK_ROUTES)
+        )
+        return self._risk(min_distance2, self.HIGH_RISK_ROUTES[nearest])
+    
+    def get_route_risk_batch(self, lats: np.ndarray, lons: np.ndarray) -> List[dict]:
+        """get_route_risk for many locations, via one locations x hotspots distance matrix."""
+        distance2 = ((np.asarray(lats, dtype=float)[:, None] - self._HOTSPOT_LATS)**2
+                     + (np.asarray(lons, dtype=float)[:, None] - self._HOTSPOT_LONS)**2)
+        nearest = distance2.argmin(axis=1)
+        min_distance2 = distance2[np.arange(len(nearest)), nearest]
+        return [self._risk(d2, self.HIGH_RISK_ROUTES[i])
+                for d2, i in zip(min_distance2.tolist(), nearest.tolist())]
+    
+    @staticmethod
+    def _risk(min_distance2: float, nearest_hotspot: dict) -> dict:
+        """Risk for a location from its squared distance (in degrees) to the nearest hotspot."""
+        if min_distance2 < 0.5**2:
             return {
                 'risk_level': 'high',
                 'risk_score': nearest_hotspot['risk_factor'],
                 'hotspot': nearest_hotspot['name'],
                 'color': '#e74c3c'
             }
-        elif min_distance < 1.0:
+        elif min_distance2 < 1.0:
             return {
                 'risk_level': 'medium',
                 'risk_score': 0.4,
@@ -148,6 +164,9 @@ class HistoricalDataService:
                 description="Quick response alert, thieves caught"
             ),
         ]
+        # Hotspots counted once and records kept newest first, since they never change after this
+        self._hotspot_counts = Counter(t.location for t in self.theft_records).most_common(5)
+        self.theft_records.sort(key=lambda x: x.date, reverse=True)
         
         self.fleet_stats = {
             'total_trucks': 156,
@@ -167,14 +186,11 @@ class HistoricalDataService:
     
     def get_recent_thefts(self, limit: int = 5) -> List[TheftRecord]:
         """Get recent theft incidents."""
-        return sorted(self.theft_records, key=lambda x: x.date, reverse=True)[:limit]
+        return self.theft_records[:limit]
     
     def get_theft_hotspots(self) -> List[dict]:
         """Get theft hotspot locations."""
-        from collections import Counter
-        locations = [t.location for t in self.theft_records]
-        counts = Counter(locations)
-        return [{'location': loc, 'count': cnt} for loc, cnt in counts.most_common(5)]
+        return [{'location': loc, 'count': cnt} for loc, cnt in self._hotspot_counts]
     
     def get_monthly_stats(self) -> dict:
         """Get monthly theft statistics."""
@@ -2,16 +2,17 @@
 Data simulator for GPS and weight sensor streams.
 Generates realistic transit data with normal and pilferage scenarios.
 """
-import random
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List, Generator
 import math
 
-from .geofences import AUTHORIZED_ZONES, haversine_distance, is_in_authorized_zone
+import numpy as np
 
+from .geofences import AUTHORIZED_ZONES, haversine_distance, zones_for_points
 
-@dataclass
+
+@dataclass(slots=True)
 class GPSReading:
     """Single GPS reading from a truck."""
     truck_id: str
@@ -22,7 +23,7 @@ class GPSReading:
     is_moving: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class WeightReading:
     """Single weight sensor reading."""
     truck_id: str
@@ -31,7 +32,7 @@ class WeightReading:
     weight_change_kg: float  # Change from previous reading
 
 
-@dataclass
+@dataclass(slots=True)
 class TruckState:
     """Current state of a truck."""
     truck_id: str
@@ -44,6 +45,13 @@ class TruckState:
     last_update: datetime = field(default_factory=datetime.now)
 
 
+def _rounded(lats: np.ndarray, lons: np.ndarray, speeds: np.ndarray,
+             weights: np.ndarray, weight_changes: np.ndarray) -> tuple[list, ...]:
+    """Event fields rounded as reported (6 decimals for position, 1 otherwise), as Python floats."""
+    return (np.round(lats, 6).tolist(), np.round(lons, 6).tolist(), np.round(speeds, 1).tolist(),
+            np.round(weights, 1).tolist(), np.round(weight_changes, 1).tolist())
+
+
 class TransitSimulator:
     """Simulates truck transit from origin to destination."""
     
@@ -71,6 +79,7 @@ class TransitSimulator:
         self.stop_start = None
         self.events: List[dict] = []
         self.current_time = datetime.now()
+        self.rng = np.random.default_rng()
         
     def _interpolate_position(self, progress: float) -> tuple[float, float]:
         """Interpolate position between waypoints."""
@@ -84,53 +93,79 @@ class TransitSimulator:
         lon = start[1] + (end[1] - start[1]) * progress
         return lat, lon
     
+    def _route_track(self, total_readings: int) -> tuple[np.ndarray, np.ndarray, list]:
+        """Positions and zone lookups for every reading of a journey, computed as arrays."""
+        waypoints = np.array(self.ROUTE_WAYPOINTS)
+        segments = len(self.ROUTE_WAYPOINTS) - 1
+        
+        # Same progress -> (segment, fraction) split as _interpolate_position, for all readings at once
+        progress = np.arange(total_readings) / total_readings * segments
+        index = np.minimum(progress.astype(int), segments - 1)
+        fraction = (progress % 1)[:, None]
+        
+        track = waypoints[index] + (waypoints[index + 1] - waypoints[index]) * fraction
+        lats, lons = track[:, 0], track[:, 1]
+        zones = zones_for_points(lats, lons)
+        
+        # Leave the simulator where a step-by-step run would have
+        self.waypoint_index = int(index[-1])
+        self.current_lat, self.current_lon = float(lats[-1]), float(lons[-1])
+        return lats, lons, zones
+    
+    def _timestamps(self, total_readings: int) -> List[str]:
+        """ISO timestamps one minute apart, advancing the simulator clock."""
+        start = self.current_time
+        self.current_time += timedelta(minutes=total_readings)
+        # One datetime64 add for the whole journey; same strings as datetime.isoformat,
+        # which only shows microseconds when there are any
+        unit = 'us' if start.microsecond else 's'
+        times = np.datetime64(start, unit) + np.arange(1, total_readings + 1) * np.timedelta64(1, 'm')
+        return np.datetime_as_string(times, unit=unit).tolist()
+    
+    def _highway_speeds(self, zones: list) -> np.ndarray:
+        """Normal highway speed, or 0 at authorized rest stops and checkpoints."""
+        speeds = self.rng.uniform(40, 60, len(zones))
+        at_stop = [in_zone and zone is not None and zone.zone_type in ('rest_stop', 'checkpoint')
+                   for in_zone, zone in zones]
+        speeds[at_stop] = 0.0
+        return speeds
+    
     def generate_normal_journey(self, duration_hours: float = 4.0) -> List[dict]:
         """Generate a normal journey without any pilferage."""
-        events = []
         readings_per_hour = 60  # One reading per minute
         total_readings = int(duration_hours * readings_per_hour)
+        if total_readings <= 0:
+            return []  # Nothing to report, and the truck's state stays as it was
+        
+        timestamps = self._timestamps(total_readings)
+        lats, lons, zones = self._route_track(total_readings)
+        speeds = self._highway_speeds(zones)
         
-        for i in range(total_readings):
-            self.current_time += timedelta(minutes=1)
-            progress = i / total_readings
-            
-            # Move through waypoints
-            self.waypoint_index = min(int(progress * (len(self.ROUTE_WAYPOINTS) - 1)), 
-                                      len(self.ROUTE_WAYPOINTS) - 2)
-            segment_progress = (progress * (len(self.ROUTE_WAYPOINTS) - 1)) % 1
-            
-            self.current_lat, self.current_lon = self._interpolate_position(segment_progress)
-            
-            # Check if at authorized stop
-            in_zone, zone = is_in_authorized_zone(self.current_lat, self.current_lon)
-            
-            # Simulate stops at authorized zones
-            if in_zone and zone and zone.zone_type in ['rest_stop', 'checkpoint']:
-                self.speed = 0.0
-                self.is_moving = False
-            else:
-                self.speed = random.uniform(40, 60)  # Normal highway speed
-                self.is_moving = True
-            
-            # Weight stays constant (no pilferage)
-            weight_change = random.uniform(-2, 2)  # Minor sensor noise
-            
-            events.append({
-                'timestamp': self.current_time.isoformat(),
+        # Weight stays constant (no pilferage)
+        weight_changes = self.rng.uniform(-2, 2, total_readings)  # Minor sensor noise
+        weights = self.current_weight + weight_changes
+        
+        self.speed = float(speeds[-1])
+        self.is_moving = self.speed > 0
+        
+        return [
+            {
+                'timestamp': ts,
                 'truck_id': self.truck_id,
-                'latitude': round(self.current_lat, 6),
-                'longitude': round(self.current_lon, 6),
-                'speed_kmh': round(self.speed, 1),
-                'is_moving': self.is_moving,
-                'weight_kg': round(self.current_weight + weight_change, 1),
-                'weight_change_kg': round(weight_change, 1),
+                'latitude': lat,
+                'longitude': lon,
+                'speed_kmh': speed,
+                'is_moving': speed > 0,
+                'weight_kg': weight,
+                'weight_change_kg': change,
                 'in_authorized_zone': in_zone,
                 'zone_name': zone.name if zone else None,
                 'alert_level': 0,  # No alert
                 'scenario': 'normal'
-            })
-        
-        return events
+            }
+            for ts, lat, lon, speed, weight, change, (in_zone, zone) in zip(
+                timestamps, *_rounded(lats, lons, speeds, weights, weight_changes), zones)
+        ]
     
     def generate_pilferage_scenario(self, 
                                     pilferage_at_progress: float = 0.5,
@@ -143,72 +178,49 @@ class TransitSimulator:
         total_readings = int(duration_hours * readings_per_hour)
         pilferage_reading = int(pilferage_at_progress * total_readings)
         pilferage_end = pilferage_reading + stop_duration_min
+        theft_reading = pilferage_reading + 5  # Weight drops 5 min into stop
+        
+        timestamps = self._timestamps(total_readings)
+        lats, lons, zones = self._route_track(total_readings)
+        speeds = self._highway_speeds(zones)
+        
+        # Pilferage scenario: truck is stopped for the whole window
+        readings = np.arange(total_readings)
+        in_stop = (readings >= pilferage_reading) & (readings < pilferage_end)
+        speeds[in_stop] = 0.0
         
-        for i in range(total_readings):
-            self.current_time += timedelta(minutes=1)
-            progress = i / total_readings
-            
-            # Move through waypoints
-            self.waypoint_index = min(int(progress * (len(self.ROUTE_WAYPOINTS) - 1)), 
-                                      len(self.ROUTE_WAYPOINTS) - 2)
-            segment_progress = (progress * (len(self.ROUTE_WAYPOINTS) - 1)) % 1
-            
-            self.current_lat, self.current_lon = self._interpolate_position(segment_progress)
-            
-            in_zone, zone = is_in_authorized_zone(self.current_lat, self.current_lon)
-            
-            # Pilferage scenario
+        weight_changes = self.rng.uniform(-2, 2, total_readings)
+        weights = self.current_weight + weight_changes
+        # Readings inside the stop carry their own sensor noise, independent of the change
+        weights[in_stop] = self.current_weight + self.rng.uniform(-2, 2, int(in_stop.sum()))
+        if theft_reading < min(pilferage_end, total_readings):
+            weight_changes[theft_reading] = -weight_stolen_kg
+            weights[theft_reading:] -= weight_stolen_kg
+            self.current_weight -= weight_stolen_kg
+        
+        self.speed = float(speeds[-1])
+        self.is_moving = self.speed > 0
+        
+        for i, (ts, lat, lon, speed, weight, change, (in_zone, zone)) in enumerate(zip(
+                timestamps, *_rounded(lats, lons, speeds, weights, weight_changes), zones)):
+            event = {
+                'timestamp': ts,
+                'truck_id': self.truck_id,
+                'latitude': lat,
+                'longitude': lon,
+                'speed_kmh': speed,
+                'is_moving': speed > 0,
+                'weight_kg': weight,
+                'weight_change_kg': change,
+                'in_authorized_zone': in_zone,
+                'zone_name': zone.name if zone else None,
+                'alert_level': 0,  # Will be calculated by engine
+                'scenario': 'pilferage' if i > pilferage_reading else 'normal'
+            }
             if pilferage_reading <= i < pilferage_end:
-                self.speed = 0.0
-                self.is_moving = False
-                
-                # Weight drops during pilferage
-                if i == pilferage_reading + 5:  # Weight drops 5 min into stop
-                    self.current_weight -= weight_stolen_kg
-                    weight_change = -weight_stolen_kg
-                else:
-                    weight_change = random.uniform(-2, 2)
-                
-                events.append({
-                    'timestamp': self.current_time.isoformat(),
-                    'truck_id': self.truck_id,
-                    'latitude': round(self.current_lat, 6),
-                    'longitude': round(self.current_lon, 6),
-                    'speed_kmh': 0.0,
-                    'is_moving': False,
-                    'weight_kg': round(self.current_weight + random.uniform(-2, 2), 1),
-                    'weight_change_kg': round(weight_change, 1),
-                    'in_authorized_zone': in_zone,
-                    'zone_name': zone.name if zone else None,
-                    'alert_level': 0,  # Will be calculated by engine
-                    'scenario': 'pilferage',
-                    'stop_duration_min': i - pilferage_reading + 1
-                })
-            else:
-                # Normal movement
-                if in_zone and zone and zone.zone_type in ['rest_stop', 'checkpoint']:
-                    self.speed = 0.0
-                    self.is_moving = False
-                else:
-                    self.speed = random.uniform(40, 60)
-                    self.is_moving = True
-                
-                weight_change = random.uniform(-2, 2)
-                
-                events.append({
-                    'timestamp': self.current_time.isoformat(),
-                    'truck_id': self.truck_id,
-                    'latitude': round(self.current_lat, 6),
-                    'longitude': round(self.current_lon, 6),
-                    'speed_kmh': round(self.speed, 1),
-                    'is_moving': self.is_moving,
-                    'weight_kg': round(self.current_weight + weight_change, 1),
-                    'weight_change_kg': round(weight_change, 1),
-                    'in_authorized_zone': in_zone,
-                    'zone_name': zone.name if zone else None,
-                    'alert_level': 0,
-                    'scenario': 'pilferage' if i > pilferage_reading else 'normal'
-                })
+                event['scenario'] = 'pilferage'
+                event['stop_duration_min'] = i - pilferage_reading + 1
+            events.append(event)
         
         return events
 
@@ -1,12 +1,15 @@
 """
 Alert Escalation System - 4-level SOP-based alert escalation.
 """
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import IntEnum
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
+import bisect
 import sys
 import os
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from engine.stop_analyzer import StopEvent
@@ -22,7 +25,36 @@ class AlertLevel(IntEnum):
     EMERGENCY = 4  # L4: Security team, police, lock cargo
 
 
-@dataclass
+# Actions recorded when an alert reaches each level, on top of those of the levels below
+_ACTIONS_BY_LEVEL: Dict[AlertLevel, Tuple[str, ...]] = {
+    AlertLevel.NORMAL: (),
+    AlertLevel.WATCHLIST: (
+        "📋 Logged to system audit trail",
+    ),
+    AlertLevel.WARNING: (
+        "📱 SMS sent to driver requesting confirmation",
+    ),
+    AlertLevel.CRITICAL: (
+        "📞 Auto-call initiated to driver",
+        "🏢 Control center notified",
+    ),
+    AlertLevel.EMERGENCY: (
+        "🚔 Security team dispatched",
+        "📍 Nearest police station notified",
+        "🔒 Cargo lock signal sent (if available)",
+    ),
+}
+# EscalationEngine callbacks (attribute names) run when an alert reaches each level
+_CALLBACKS_BY_LEVEL: Dict[AlertLevel, Tuple[str, ...]] = {
+    AlertLevel.NORMAL: (),
+    AlertLevel.WATCHLIST: (),
+    AlertLevel.WARNING: ("on_sms_driver",),
+    AlertLevel.CRITICAL: ("on_call_driver", "on_alert_control_center"),
+    AlertLevel.EMERGENCY: ("on_dispatch_security",),
+}
+
+
+@dataclass(slots=True)
 class Alert:
     """Unified alert object."""
     alert_id: str
@@ -39,6 +71,9 @@ class Alert:
     is_resolved: bool = False
     resolution_time: Optional[datetime] = None
     resolution_notes: str = ""
+    duplicate_count: int = 0  # Re-fires folded into this alert, see EscalationEngine._find_duplicate
+    last_seen: Optional[datetime] = None
+    executed_level: AlertLevel = AlertLevel.NORMAL  # Highest level whose actions have run
 
 
 class EscalationEngine:
@@ -56,21 +91,86 @@ class EscalationEngine:
     L2_TIMEOUT_MIN = 5   # Wait 5 min for driver response
     L3_TIMEOUT_MIN = 3   # Wait 3 min before escalating to L4
     
+    # Most recent alerts kept per truck for window queries; older ones are dropped so a
+    # long-running engine stays bounded. Trimmed back once a tenth over, as in the analyzers
+    MAX_ALERT_HISTORY = 10_000
+    
     def __init__(self):
         self.active_alerts: Dict[str, Alert] = {}  # alert_id -> Alert
         self.alert_history: List[Alert] = []
         self.alert_counter = 0
+        # Date part of alert IDs, reformatted only once the local day is over
+        self._id_date = ""
+        self._id_date_ends = 0.0  # time.time() of the next local midnight
+        # (truck, source, level, ~100 m cell) -> active alert_id, so a sustained anomaly
+        # updates one alert instead of minting (and notifying) a new one every reading
+        self._dedupe_index: Dict[tuple, str] = {}
+        self._dedupe_keys: Dict[str, tuple] = {}  # The reverse, to drop an alert's entry on resolve
+        # Active alerts bucketed by current level (insertion ordered), for O(1) level queries
+        self._by_level: Dict[AlertLevel, Dict[str, Alert]] = {level: {} for level in AlertLevel}
+        # Per truck, every alert (active or resolved) and its timestamp, sorted by timestamp
+        # for window queries; alerts can arrive out of order (a stop alert carries its start time)
+        self._truck_times: Dict[str, List[datetime]] = {}
+        self._truck_alerts: Dict[str, List[Alert]] = {}
         
         # Callbacks for actions (can be overridden)
         self.on_sms_driver: Optional[Callable] = None
         self.on_call_driver: Optional[Callable] = None
         self.on_alert_control_center: Optional[Callable] = None
         self.on_dispatch_security: Optional[Callable] = None
+        # Set to e.g. a ThreadPoolExecutor when the callbacks do network I/O (SMS gateway,
+        # telephony), so they run off the detection path instead of blocking it
+        self.notify_executor: Optional[Executor] = None
     
     def _generate_alert_id(self) -> str:
         """Generate unique alert ID."""
         self.alert_counter += 1
-        return f"ALT-{datetime.now().strftime('%Y%m%d')}-{self.alert_counter:04d}"
+        if time.time() >= self._id_date_ends:
+            now = datetime.now()
+            self._id_date = now.strftime('%Y%m%d')
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            self._id_date_ends = midnight.timestamp()
+        return f"ALT-{self._id_date}-{self.alert_counter:04d}"
+    
+    @staticmethod
+    def _dedupe_key(truck_id: str, source: str, level: AlertLevel, latitude: float, longitude: float) -> tuple:
+        """Identity of an alert for deduplication: same truck, source and level within ~100 m."""
+        return (truck_id, source, int(level), int(latitude * 1000), int(longitude * 1000))
+    
+    def _find_duplicate(self, key: tuple, timestamp: datetime, description: str) -> Optional[Alert]:
+        """Fold a re-fire into the matching active alert, if any; no actions are re-run."""
+        alert_id = self._dedupe_index.get(key)
+        if alert_id is None:
+            return None
+        
+        alert = self.active_alerts[alert_id]
+        alert.duplicate_count += 1
+        alert.last_seen = timestamp
+        alert.description = description
+        alert.escalation_history.append({
+            'timestamp': datetime.now().isoformat(),
+            'level': alert.level.name,
+            'repeat': alert.duplicate_count
+        })
+        return alert
+    
+    def _activate(self, alert: Alert, key: tuple) -> Alert:
+        """Run the level actions for a new alert and make it active."""
+        self._execute_level_actions(alert)
+        self.active_alerts[alert.alert_id] = alert
+        self._by_level[alert.level][alert.alert_id] = alert
+        self._dedupe_index[key] = alert.alert_id
+        self._dedupe_keys[alert.alert_id] = key
+        
+        times = self._truck_times.setdefault(alert.truck_id, [])
+        i = bisect.bisect_right(times, alert.timestamp)
+        times.insert(i, alert.timestamp)
+        alerts = self._truck_alerts.setdefault(alert.truck_id, [])
+        alerts.insert(i, alert)
+        if len(times) > self.MAX_ALERT_HISTORY * 1.1:
+            del times[:-self.MAX_ALERT_HISTORY]
+            del alerts[:-self.MAX_ALERT_HISTORY]
+        return alert
     
     def process_stop_event(self, event: StopEvent) -> Optional[Alert]:
         """Process a stop event and generate appropriate alert."""
@@ -91,6 +191,12 @@ class EscalationEngine:
                 level = AlertLevel.WATCHLIST
                 title = "Unauthorized Stop Detected"
         
+        key = self._dedupe_key(event.truck_id, 'stop_analyzer', level, event.latitude, event.longitude)
+        seen = event.end_time or event.start_time + timedelta(minutes=event.duration_minutes)  # Ongoing stops have no end yet
+        duplicate = self._find_duplicate(key, seen, event.reason)
+        if duplicate is not None:
+            return duplicate
+        
         alert = Alert(
             alert_id=self._generate_alert_id(),
             truck_id=event.truck_id,
@@ -104,9 +210,7 @@ class EscalationEngine:
             actions_taken=[]
         )
         
-        self._execute_level_actions(alert)
-        self.active_alerts[alert.alert_id] = alert
-        return alert
+        return self._activate(alert, key)
     
     def process_weight_alert(self, weight_alert: WeightAlert) -> Optional[Alert]:
         """Process a weight alert and generate appropriate alert."""
@@ -124,6 +228,12 @@ class EscalationEngine:
             level = AlertLevel.WATCHLIST
             title = "Weight Anomaly Detected"
         
+        key = self._dedupe_key(weight_alert.truck_id, 'weight_analyzer', level,
+                               weight_alert.latitude, weight_alert.longitude)
+        duplicate = self._find_duplicate(key, weight_alert.timestamp, weight_alert.reason)
+        if duplicate is not None:
+            return duplicate
+        
         alert = Alert(
             alert_id=self._generate_alert_id(),
             truck_id=weight_alert.truck_id,
@@ -137,9 +247,7 @@ class EscalationEngine:
             actions_taken=[]
         )
         
-        self._execute_level_actions(alert)
-        self.active_alerts[alert.alert_id] = alert
-        return alert
+        return self._activate(alert, key)
     
     def process_combined_event(self, stop_event: StopEvent, weight_alert: WeightAlert) -> Alert:
         """
@@ -149,6 +257,17 @@ class EscalationEngine:
         """
         # This is the critical SOP condition - immediate L4 escalation
         level = AlertLevel.EMERGENCY
+        description = (
+            f"SOP TRIGGERED: Weight drop of {weight_alert.weight_drop_kg:.1f}kg "
+            f"detected while truck stopped at unauthorized location for "
+            f"{stop_event.duration_minutes:.1f} minutes. "
+            f"Immediate security protocol initiated."
+        )
+        
+        key = self._dedupe_key(stop_event.truck_id, 'combined', level, stop_event.latitude, stop_event.longitude)
+        duplicate = self._find_duplicate(key, weight_alert.timestamp, description)
+        if duplicate is not None:
+            return duplicate
         
         alert = Alert(
             alert_id=self._generate_alert_id(),
@@ -157,77 +276,81 @@ class EscalationEngine:
             level=level,
             source='combined',
             title="🚨 EMERGENCY: Weight Drop During Unauthorized Stop",
-            description=(
-                f"SOP TRIGGERED: Weight drop of {weight_alert.weight_drop_kg:.1f}kg "
-                f"detected while truck stopped at unauthorized location for "
-                f"{stop_event.duration_minutes:.1f} minutes. "
-                f"Immediate security protocol initiated."
-            ),
+            description=description,
             latitude=stop_event.latitude,
             longitude=stop_event.longitude,
             actions_taken=[]
         )
         
-        self._execute_level_actions(alert)
-        self.active_alerts[alert.alert_id] = alert
-        return alert
+        return self._activate(alert, key)
     
     def _execute_level_actions(self, alert: Alert):
-        """Execute actions based on alert level."""
+        """Execute the actions of each level the alert has reached since its actions last ran."""
+        # Escalating L2 -> L3 runs only the L3 actions; the driver already has the L2 SMS
         actions = []
+        for level in range(alert.executed_level + 1, alert.level + 1):
+            actions.extend(_ACTIONS_BY_LEVEL[level])
+            for callback in _CALLBACKS_BY_LEVEL[level]:
+                self._notify(getattr(self, callback), alert)
         
-        if alert.level >= AlertLevel.WATCHLIST:
-            actions.append("📋 Logged to system audit trail")
-        
-        if alert.level >= AlertLevel.WARNING:
-            actions.append("📱 SMS sent to driver requesting confirmation")
-            if self.on_sms_driver:
-                self.on_sms_driver(alert)
-        
-        if alert.level >= AlertLevel.CRITICAL:
-            actions.append("📞 Auto-call initiated to driver")
-            actions.append("🏢 Control center notified")
-            if self.on_call_driver:
-                self.on_call_driver(alert)
-            if self.on_alert_control_center:
-                self.on_alert_control_center(alert)
-        
-        if alert.level >= AlertLevel.EMERGENCY:
-            actions.append("🚔 Security team dispatched")
-            actions.append("📍 Nearest police station notified")
-            actions.append("🔒 Cargo lock signal sent (if available)")
-            if self.on_dispatch_security:
-                self.on_dispatch_security(alert)
-        
-        alert.actions_taken = actions
+        alert.executed_level = max(alert.executed_level, alert.level)
+        alert.actions_taken.extend(actions)
         alert.escalation_history.append({
             'timestamp': datetime.now().isoformat(),
             'level': alert.level.name,
             'actions': actions
         })
     
+    def _notify(self, callback: Optional[Callable], alert: Alert):
+        """Run an action callback, if set: inline, or on notify_executor when there is one."""
+        if callback is None:
+            return
+        if self.notify_executor is not None:
+            self.notify_executor.submit(callback, alert)
+        else:
+            callback(alert)
+    
     def escalate_alert(self, alert_id: str, reason: str = "No response") -> Optional[Alert]:
         """Escalate an existing alert to the next level."""
-        if alert_id not in self.active_alerts:
+        alert = self.active_alerts.get(alert_id)
+        if alert is None:
             return None
         
-        alert = self.active_alerts[alert_id]
-        
         if alert.level < AlertLevel.EMERGENCY:
             new_level = AlertLevel(alert.level + 1)
+            del self._by_level[alert.level][alert_id]
+            self._by_level[new_level][alert_id] = alert
             alert.level = new_level
+            self._rekey(alert_id, new_level)
             alert.description += f" [ESCALATED: {reason}]"
             self._execute_level_actions(alert)
             return alert
         
         return alert
     
+    def _rekey(self, alert_id: str, level: AlertLevel):
+        """Move an alert's dedupe entry to its new level, so re-fires at that level fold into it."""
+        key = self._dedupe_keys.pop(alert_id, None)
+        if key is None:
+            return
+        del self._dedupe_index[key]
+        new_key = key[:2] + (int(level),) + key[3:]
+        # Another active alert already holds that identity; it keeps it and this one stops deduplicating
+        if new_key not in self._dedupe_index:
+            self._dedupe_index[new_key] = alert_id
+            self._dedupe_keys[alert_id] = new_key
+    
     def resolve_alert(self, alert_id: str, notes: str = "") -> Optional[Alert]:
         """Mark an alert as resolved."""
-        if alert_id not in self.active_alerts:
+        alert = self.active_alerts.pop(alert_id, None)
+        if alert is None:
             return None
         
-        alert = self.active_alerts.pop(alert_id)
+        del self._by_level[alert.level][alert_id]
+        # A later re-fire of a resolved alert is a new alert
+        key = self._dedupe_keys.pop(alert_id, None)
+        if key is not None:
+            del self._dedupe_index[key]
         alert.is_resolved = True
         alert.resolution_time = datetime.now()
         alert.resolution_notes = notes
@@ -238,20 +361,21 @@ class EscalationEngine:
         """Get all currently active alerts."""
         return list(self.active_alerts.values())
     
+    def get_alerts_in_window(self, truck_id: str, start: datetime, end: datetime) -> List[Alert]:
+        """Alerts for a truck timestamped within [start, end], active or resolved, oldest first."""
+        times = self._truck_times.get(truck_id, [])
+        lo = bisect.bisect_left(times, start)
+        hi = bisect.bisect_right(times, end)
+        return self._truck_alerts[truck_id][lo:hi] if hi > lo else []
+    
     def get_alerts_by_level(self, level: AlertLevel) -> List[Alert]:
         """Get all active alerts of a specific level."""
-        return [a for a in self.active_alerts.values() if a.level == level]
+        return list(self._by_level[level].values())
     
     def get_alert_summary(self) -> dict:
         """Get summary of current alert status."""
         return {
             'total_active': len(self.active_alerts),
-            'by_level': {
-                'normal': len([a for a in self.active_alerts.values() if a.level == AlertLevel.NORMAL]),
-                'watchlist': len([a for a in self.active_alerts.values() if a.level == AlertLevel.WATCHLIST]),
-                'warning': len([a for a in self.active_alerts.values() if a.level == AlertLevel.WARNING]),
-                'critical': len([a for a in self.active_alerts.values() if a.level == AlertLevel.CRITICAL]),
-                'emergency': len([a for a in self.active_alerts.values() if a.level == AlertLevel.EMERGENCY]),
-            },
+            'by_level': {level.name.lower(): len(alerts) for level, alerts in self._by_level.items()},
             'total_resolved': len(self.alert_history)
         }
@@ -7,12 +7,14 @@ from typing import Dict, List, Optional
 import sys
 import os
 
+import numpy as np
+
 # Add parent to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data.geofences import is_in_authorized_zone, get_max_stop_duration
+from data.geofences import is_in_authorized_zone_cached, get_max_stop_duration
 
 
-@dataclass
+@dataclass(slots=True)
 class StopEvent:
     """Represents a detected stop event."""
     truck_id: str
@@ -34,9 +36,15 @@ class StopAnalyzer:
     MIN_STOP_DURATION_MIN = 3  # Minimum duration to consider as a stop (not just traffic)
     SUSPICIOUS_UNAUTHORIZED_STOP_MIN = 10  # Unauthorized stop > 10 min is suspicious
     
+    # Most recent stops kept in memory; older ones are dropped so a long-running analyzer stays bounded.
+    # The lists are trimmed back to this once they are a tenth over, so appends stay amortized O(1)
+    MAX_STOP_HISTORY = 10_000
+    
     def __init__(self):
         self.active_stops: Dict[str, dict] = {}  # truck_id -> stop info
         self.completed_stops: List[StopEvent] = []
+        # The suspicious stops among them, in order (bounded on its own, so it reaches further back)
+        self._suspicious_stops: List[StopEvent] = []
     
     def process_reading(self, reading: dict) -> Optional[StopEvent]:
         """Process a single GPS/weight reading and detect stops."""
@@ -49,59 +57,14 @@ class StopAnalyzer:
         # Check if truck just stopped
         if not is_moving and truck_id not in self.active_stops:
             # Start tracking this stop
-            in_zone, zone = is_in_authorized_zone(lat, lon)
-            self.active_stops[truck_id] = {
-                'start_time': timestamp,
-                'latitude': lat,
-                'longitude': lon,
-                'in_authorized_zone': in_zone,
-                'zone_name': zone.name if zone else None,
-                'max_allowed_duration': zone.max_stop_duration_min if zone else 0
-            }
+            self.active_stops[truck_id] = self._start_stop(timestamp, lat, lon)
             return None
         
         # Check if truck resumed movement (stop ended)
         elif is_moving and truck_id in self.active_stops:
-            stop_info = self.active_stops.pop(truck_id)
-            duration = (timestamp - stop_info['start_time']).total_seconds() / 60
-            
-            # Ignore very short stops (traffic, etc.)
-            if duration < self.MIN_STOP_DURATION_MIN:
-                return None
-            
-            # Determine if suspicious
-            is_suspicious = False
-            reason = ""
-            
-            if not stop_info['in_authorized_zone']:
-                if duration >= self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN:
-                    is_suspicious = True
-                    reason = f"Unauthorized stop of {duration:.1f} min (threshold: {self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN} min)"
-            else:
-                if duration > stop_info['max_allowed_duration']:
-                    is_suspicious = True
-                    reason = f"Stop exceeded allowed duration: {duration:.1f} min > {stop_info['max_allowed_duration']} min"
-            
-            if not is_suspicious:
-                if stop_info['in_authorized_zone']:
-                    reason = f"Authorized stop at {stop_info['zone_name']}"
-                else:
-                    reason = f"Brief unauthorized stop ({duration:.1f} min < {self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN} min)"
-            
-            stop_event = StopEvent(
-                truck_id=truck_id,
-                start_time=stop_info['start_time'],
-                end_time=timestamp,
-                latitude=stop_info['latitude'],
-                longitude=stop_info['longitude'],
-                duration_minutes=duration,
-                is_authorized=stop_info['in_authorized_zone'],
-                zone_name=stop_info['zone_name'],
-                is_suspicious=is_suspicious,
-                reason=reason
-            )
-            
-            self.completed_stops.append(stop_event)
+            stop_event = self._end_stop(truck_id, self.active_stops.pop(truck_id), timestamp)
+            if stop_event is not None:
+                self._complete_stop(stop_event)
             return stop_event
         
         # Check ongoing stops for suspicious duration
@@ -112,25 +75,185 @@ class StopAnalyzer:
             # Check if unauthorized stop is becoming suspicious
             if not stop_info['in_authorized_zone'] and duration >= self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN:
                 # Return a warning (stop still ongoing)
-                return StopEvent(
-                    truck_id=truck_id,
-                    start_time=stop_info['start_time'],
-                    end_time=None,  # Still ongoing
-                    latitude=stop_info['latitude'],
-                    longitude=stop_info['longitude'],
-                    duration_minutes=duration,
-                    is_authorized=False,
-                    zone_name=None,
-                    is_suspicious=True,
-                    reason=f"ONGOING: Unauthorized stop now at {duration:.1f} min"
-                )
+                return self._ongoing_stop(truck_id, stop_info, duration)
         
         return None
     
+    def process_batch(self, readings: np.ndarray) -> List[StopEvent]:
+        """
+        process_reading over a whole sequence of readings (e.g. a journey replay), given as a
+        structured array with 'truck_id', 'timestamp' (datetime64), 'latitude', 'longitude' and
+        'is_moving' fields. Stops are found as runs of stationary readings per truck with array
+        operations, so only stop boundaries and suspicious readings run Python code.
+        Returns the events process_reading would have returned, in reading order.
+        """
+        found = self._process_columns(readings['truck_id'].tolist(), readings['timestamp'], readings['is_moving'],
+                                      readings['latitude'], readings['longitude'])
+        return [event for _, event in found]
+    
+    def process_readings_batch(self, readings: List[dict]) -> List[Optional[StopEvent]]:
+        """
+        process_reading for each of a list of reading dicts, with the timestamps parsed in one
+        NumPy call instead of one fromisoformat each. Results line up with readings.
+        """
+        results: List[Optional[StopEvent]] = [None] * len(readings)
+        found = self._process_columns(
+            [r['truck_id'] for r in readings],
+            np.array([r['timestamp'] for r in readings], dtype='datetime64[us]'),
+            np.fromiter((r['is_moving'] for r in readings), dtype=bool, count=len(readings)),
+            np.fromiter((r['latitude'] for r in readings), dtype=np.float64, count=len(readings)),
+            np.fromiter((r['longitude'] for r in readings), dtype=np.float64, count=len(readings)))
+        for row, event in found:
+            results[row] = event
+        return results
+    
+    def _process_columns(self, truck_ids: List[str], times: np.ndarray, moving: np.ndarray,
+                         lats: np.ndarray, lons: np.ndarray) -> List[tuple]:
+        """Batch processing over reading columns; returns (reading index, StopEvent) pairs in reading order."""
+        if len(truck_ids) == 0:
+            return []
+        
+        times = times.astype('datetime64[us]')
+        moving = moving.astype(bool)
+        
+        # Group each truck's readings, keeping their order (trucks numbered as first seen)
+        codes: Dict[str, int] = {}
+        truck_of = np.fromiter((codes.setdefault(t, len(codes)) for t in truck_ids),
+                               dtype=np.intp, count=len(truck_ids))
+        order = np.argsort(truck_of, kind='stable')
+        bounds = np.searchsorted(truck_of[order], np.arange(len(codes) + 1))
+        
+        found = []  # (reading index, StopEvent)
+        for t, truck_id in enumerate(codes):
+            rows = order[bounds[t]:bounds[t + 1]]
+            found.extend(self._process_truck(truck_id, rows, times[rows], moving[rows], lats[rows], lons[rows]))
+        
+        found.sort(key=lambda item: item[0])
+        for _, event in found:
+            if event.end_time is not None:
+                self._complete_stop(event)
+        return found
+    
+    def _process_truck(self, truck_id: str, rows: np.ndarray, times: np.ndarray, moving: np.ndarray,
+                       lats: np.ndarray, lons: np.ndarray) -> List[tuple]:
+        """process_batch for one truck's readings; returns (reading index, StopEvent) pairs."""
+        found = []
+        stopped = ~moving
+        was_stopped = np.concatenate(([truck_id in self.active_stops], stopped[:-1]))
+        
+        # Stop runs: [start, end) of stationary readings; a stop already open continues at 0
+        starts = np.flatnonzero(stopped & ~was_stopped).tolist()
+        ends = np.flatnonzero(moving & was_stopped).tolist()
+        if was_stopped[0]:
+            starts.insert(0, 0)
+        ends += [len(rows)] * (len(starts) - len(ends))
+        
+        for start, end in zip(starts, ends):
+            if start == 0 and was_stopped[0]:
+                stop_info = self.active_stops.pop(truck_id)
+                first_ongoing = 0
+            else:
+                stop_info = self._start_stop(times[start].item(), float(lats[start]), float(lons[start]))
+                first_ongoing = start + 1
+            
+            # Ongoing unauthorized stops report every reading past the threshold
+            if not stop_info['in_authorized_zone']:
+                start_time = np.datetime64(stop_info['start_time'], 'us')
+                durations = (times[first_ongoing:end] - start_time) / np.timedelta64(1, 's') / 60
+                for offset in np.flatnonzero(durations >= self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN).tolist():
+                    found.append((rows[first_ongoing + offset],
+                                  self._ongoing_stop(truck_id, stop_info, float(durations[offset]))))
+            
+            if end < len(rows):
+                stop_event = self._end_stop(truck_id, stop_info, times[end].item())
+                if stop_event is not None:
+                    found.append((rows[end], stop_event))
+            else:
+                self.active_stops[truck_id] = stop_info
+        
+        return found
+    
+    def _complete_stop(self, stop_event: StopEvent):
+        """Record a finished stop."""
+        self.completed_stops.append(stop_event)
+        if len(self.completed_stops) > self.MAX_STOP_HISTORY * 1.1:
+            del self.completed_stops[:-self.MAX_STOP_HISTORY]
+        if stop_event.is_suspicious:
+            self._suspicious_stops.append(stop_event)
+            if len(self._suspicious_stops) > self.MAX_STOP_HISTORY * 1.1:
+                del self._suspicious_stops[:-self.MAX_STOP_HISTORY]
+    
+    def _start_stop(self, timestamp: datetime, lat: float, lon: float) -> dict:
+        """Tracking info for a stop that begins at this reading."""
+        in_zone, zone = is_in_authorized_zone_cached(lat, lon)
+        return {
+            'start_time': timestamp,
+            'latitude': lat,
+            'longitude': lon,
+            'in_authorized_zone': in_zone,
+            'zone_name': zone.name if zone else None,
+            'max_allowed_duration': zone.max_stop_duration_min if zone else 0
+        }
+    
+    def _end_stop(self, truck_id: str, stop_info: dict, timestamp: datetime) -> Optional[StopEvent]:
+        """Completed stop event for a stop ending at timestamp, or None if it was too short to count."""
+        duration = (timestamp - stop_info['start_time']).total_seconds() / 60
+        
+        # Ignore very short stops (traffic, etc.)
+        if duration < self.MIN_STOP_DURATION_MIN:
+            return None
+        
+        # Determine if suspicious
+        is_suspicious = False
+        reason = ""
+        
+        if not stop_info['in_authorized_zone']:
+            if duration >= self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN:
+                is_suspicious = True
+                reason = f"Unauthorized stop of {duration:.1f} min (threshold: {self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN} min)"
+        else:
+            if duration > stop_info['max_allowed_duration']:
+                is_suspicious = True
+                reason = f"Stop exceeded allowed duration: {duration:.1f} min > {stop_info['max_allowed_duration']} min"
+        
+        if not is_suspicious:
+            if stop_info['in_authorized_zone']:
+                reason = f"Authorized stop at {stop_info['zone_name']}"
+            else:
+                reason = f"Brief unauthorized stop ({duration:.1f} min < {self.SUSPICIOUS_UNAUTHORIZED_STOP_MIN} min)"
+        
+        return StopEvent(
+            truck_id=truck_id,
+            start_time=stop_info['start_time'],
+            end_time=timestamp,
+            latitude=stop_info['latitude'],
+            longitude=stop_info['longitude'],
+            duration_minutes=duration,
+            is_authorized=stop_info['in_authorized_zone'],
+            zone_name=stop_info['zone_name'],
+            is_suspicious=is_suspicious,
+            reason=reason
+        )
+    
+    def _ongoing_stop(self, truck_id: str, stop_info: dict, duration: float) -> StopEvent:
+        """Warning for an unauthorized stop that is still ongoing past the threshold."""
+        return StopEvent(
+            truck_id=truck_id,
+            start_time=stop_info['start_time'],
+            end_time=None,  # Still ongoing
+            latitude=stop_info['latitude'],
+            longitude=stop_info['longitude'],
+            duration_minutes=duration,
+            is_authorized=False,
+            zone_name=None,
+            is_suspicious=True,
+            reason=f"ONGOING: Unauthorized stop now at {duration:.1f} min"
+        )
+    
     def get_active_stops(self) -> Dict[str, dict]:
         """Get all currently active (ongoing) stops."""
         return self.active_stops
     
     def get_suspicious_stops(self) -> List[StopEvent]:
         """Get all suspicious stops detected so far."""
-        return [s for s in self.completed_stops if s.is_suspicious]
+        return list(self._suspicious_stops)
@@ -8,11 +8,13 @@ from typing import Dict, List, Optional, Tuple
 import sys
 import os
 
+import numpy as np
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from data.geofences import is_in_authorized_zone
+from data.geofences import is_in_authorized_zone_cached
 
 
-@dataclass
+@dataclass(slots=True)
 class WeightProfile:
     """Weight profile for a truck at trip start."""
     truck_id: str
@@ -27,7 +29,7 @@ class WeightProfile:
         return self.total_weight_kg - self.packaging_weight_kg
 
 
-@dataclass
+@dataclass(slots=True)
 class WeightAlert:
     """Represents a weight anomaly alert."""
     truck_id: str
@@ -59,11 +61,17 @@ class EnhancedWeightAnalyzer:
     SUSPICIOUS_DROP_KG = 50  # Suspicious weight drop
     CRITICAL_DROP_KG = 200  # Critical theft indicator
     
+    # Most recent alerts kept in memory; older ones are dropped so a long-running analyzer stays bounded.
+    # weight_alerts is trimmed back to this once it is a tenth over, so appends stay amortized O(1)
+    MAX_ALERT_HISTORY = 10_000
+    
     def __init__(self):
         self.weight_profiles: Dict[str, WeightProfile] = {}
         self.previous_weights: Dict[str, float] = {}
         self.weight_alerts: List[WeightAlert] = []
         self.total_detected_loss: Dict[str, float] = {}
+        # Per-truck [alerts, suspicious alerts], so trip summaries don't rescan weight_alerts
+        self._alert_counts: Dict[str, List[int]] = {}
     
     def register_trip(self, truck_id: str, total_weight: float, 
                       packaging_weight: float = 50.0, destination: str = "") -> WeightProfile:
@@ -153,10 +161,53 @@ class EnhancedWeightAnalyzer:
         if weight_change >= 0:
             return None
         
-        weight_drop = abs(weight_change)
+        return self._drop_alert(truck_id, timestamp, lat, lon, is_moving, previous_weight, current_weight)
+    
+    def process_readings_batch(self, readings: List[dict]) -> List[Optional[WeightAlert]]:
+        """
+        process_reading for each of a list of readings (e.g. a journey replay). Each truck's weight
+        changes come from one array diff, so only drops past the noise threshold run Python code
+        (and parse their timestamp). Results line up with readings.
+        """
+        results: List[Optional[WeightAlert]] = [None] * len(readings)
+        weights = np.fromiter((r['weight_kg'] for r in readings), dtype=np.float64, count=len(readings))
+        by_truck: Dict[str, List[int]] = {}
+        for row, reading in enumerate(readings):
+            by_truck.setdefault(reading['truck_id'], []).append(row)
+        
+        drops = []  # (reading index, truck_id, previous weight)
+        for truck_id, rows in by_truck.items():
+            truck_weights = weights[rows]
+            # Auto-register on the truck's first reading
+            if truck_id not in self.previous_weights:
+                self.register_trip(truck_id, readings[rows[0]]['weight_kg'])
+                rows, truck_weights = rows[1:], truck_weights[1:]
+            if not rows:
+                continue
+            
+            previous = np.concatenate(([self.previous_weights[truck_id]], truck_weights[:-1]))
+            change = truck_weights - previous
+            # Same tests as process_reading: not sensor noise, and a drop
+            for i in np.flatnonzero(~(np.abs(change) < self.SENSOR_NOISE_KG) & ~(change >= 0)).tolist():
+                drops.append((rows[i], truck_id, readings[rows[i - 1]]['weight_kg'] if i else self.previous_weights[truck_id]))
+            self.previous_weights[truck_id] = readings[rows[-1]]['weight_kg']
+        
+        # Alerts are built in reading order, as the stream would append them
+        drops.sort(key=lambda drop: drop[0])
+        for row, truck_id, previous_weight in drops:
+            reading = readings[row]
+            results[row] = self._drop_alert(truck_id, datetime.fromisoformat(reading['timestamp']),
+                                            reading['latitude'], reading['longitude'], reading['is_moving'],
+                                            previous_weight, reading['weight_kg'])
+        return results
+    
+    def _drop_alert(self, truck_id: str, timestamp: datetime, lat: float, lon: float, is_moving: bool,
+                    previous_weight: float, current_weight: float) -> WeightAlert:
+        """Classify and record a weight drop past the noise threshold."""
+        weight_drop = abs(current_weight - previous_weight)
         self.total_detected_loss[truck_id] = self.total_detected_loss.get(truck_id, 0) + weight_drop
         
-        in_zone, zone = is_in_authorized_zone(lat, lon)
+        in_zone, zone = is_in_authorized_zone_cached(lat, lon)
         
         # Determine severity based on location and amount
         is_suspicious = False
@@ -206,6 +257,11 @@ class EnhancedWeightAnalyzer:
         )
         
         self.weight_alerts.append(alert)
+        if len(self.weight_alerts) > self.MAX_ALERT_HISTORY * 1.1:
+            del self.weight_alerts[:-self.MAX_ALERT_HISTORY]
+        counts = self._alert_counts.setdefault(truck_id, [0, 0])
+        counts[0] += 1
+        counts[1] += is_suspicious
         return alert
     
     def get_trip_summary(self, truck_id: str) -> dict:
@@ -216,6 +272,7 @@ class EnhancedWeightAnalyzer:
         profile = self.weight_profiles[truck_id]
         current = self.previous_weights.get(truck_id, profile.total_weight_kg)
         total_loss = self.total_detected_loss.get(truck_id, 0)
+        alerts_count, suspicious_alerts = self._alert_counts.get(truck_id, (0, 0))
         
         return {
             'initial_total': profile.total_weight_kg,
@@ -223,7 +280,6 @@ class EnhancedWeightAnalyzer:
             'initial_cargo': profile.actual_cargo_kg,
             'current_weight': current,
             'total_detected_loss': total_loss,
-            'alerts_count': len([a for a in self.weight_alerts if a.truck_id == truck_id]),
-            'suspicious_alerts': len([a for a in self.weight_alerts 
-                                      if a.truck_id == truck_id and a.is_suspicious])
+            'alerts_count': alerts_count,
+            'suspicious_alerts': suspicious_alerts
         }